@@ -4,9 +4,9 @@ Architecture Diagram Generator for Compliance-Aware Multi-Agent System
 Generates a visual representation of the system architecture
 """
 
-def generate_architecture_diagram():
-    """Generate ASCII architecture diagram"""
-    diagram = """
+# The diagrams are entirely static, so build them once at import time
+# instead of reconstructing the multi-kilobyte literals on every call.
+_ARCH_DIAGRAM = """
 COMPLIANCE-AWARE MULTI-AGENT SYSTEM ARCHITECTURE
 ================================================================================
 
@@ -122,11 +122,8 @@ Structured Response to User
 
 ================================================================================
 """
-    return diagram
 
-def generate_data_flow_diagram():
-    """Generate detailed data flow diagram"""
-    flow_diagram = """
+_FLOW_DIAGRAM = """
 DATA PROCESSING PIPELINE - DETAILED FLOW
 ================================================================================
 
@@ -177,9 +174,22 @@ STEP 5: FINAL OUTPUT
 
 ================================================================================
 """
-    return flow_diagram
+
+# Pre-encoded once so the CLI dump below skips the locale-aware codec path
+_ARCH_DIAGRAM_BYTES = _ARCH_DIAGRAM.encode('utf-8')
+_FLOW_DIAGRAM_BYTES = _FLOW_DIAGRAM.encode('utf-8')
+
+def generate_architecture_diagram():
+    """Generate ASCII architecture diagram"""
+    return _ARCH_DIAGRAM
+
+def generate_data_flow_diagram():
+    """Generate detailed data flow diagram"""
+    return _FLOW_DIAGRAM
 
 if __name__ == "__main__":
-    print(generate_architecture_diagram())
-    print("\n" + "="*80 + "\n")
-    print(generate_data_flow_diagram())
\ No newline at end of file
+    import sys
+    sys.stdout.buffer.write(_ARCH_DIAGRAM_BYTES)
+    sys.stdout.buffer.write(b"\n" + b"=" * 80 + b"\n\n")
+    sys.stdout.buffer.write(_FLOW_DIAGRAM_BYTES)
+    sys.stdout.buffer.write(b"\n")
\ No newline at end of file
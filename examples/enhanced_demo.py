@@ -1,6 +1,12 @@
 # examples/enhanced_demo.py
+import functools
+import hashlib
+import io
 import json
+import statistics
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import redirect_stdout
 from datetime import datetime
 import sys
 import os
@@ -8,17 +14,64 @@ import os
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from main import EnhancedComplianceAwareAgentSystem
-from enhanced_compliance_agent import EnhancedComplianceAgent
-from enhanced_reasoning_agent import EnhancedReasoningAgent
-from memory_system import EnhancedMemorySystem
+# Content-addressed cache for end-to-end query results: repeated demo runs
+# within the TTL skip the retrieval/reasoning/compliance pipeline entirely.
+_QUERY_CACHE = {}
+_QUERY_CACHE_TTL = 600  # seconds
+_QUERY_CACHE_MAX = 512
 
+def _cached_process_query(system, query, normalized=None):
+    """Process a query through the system, reusing recent identical results
+
+    Callers that already normalized the query can pass it in to skip the
+    redundant lower/strip pass.
+    """
+    if normalized is None:
+        normalized = query.lower().strip()
+    # Key on the system instance too: a fresh system must not be served
+    # another instance's results, or its own memory logging and analytics
+    # would be silently skipped
+    key = (id(system), hashlib.sha1(normalized.encode()).hexdigest())
+    cached = _QUERY_CACHE.get(key)
+    if cached is not None and time.monotonic() < cached[0]:
+        return cached[1]
+
+    result = system.process_query(query)
+    if len(_QUERY_CACHE) >= _QUERY_CACHE_MAX:
+        _QUERY_CACHE.clear()
+    _QUERY_CACHE[key] = (time.monotonic() + _QUERY_CACHE_TTL, result)
+    return result
+
+def _buffered_output(func):
+    """Collect a demo section's prints in memory and emit them in one write
+
+    Each demo makes dozens of individual print calls; buffering batches the
+    output into a single flush, which matters when piping to a file or CI log.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        buf = io.StringIO()
+        try:
+            with redirect_stdout(buf):
+                return func(*args, **kwargs)
+        finally:
+            sys.stdout.write(buf.getvalue())
+    return wrapper
+
+@_buffered_output
 def demo_enhanced_compliance_checks():
     """Demonstrate enhanced compliance checking capabilities"""
     print("=== ENHANCED COMPLIANCE CHECKS DEMO ===")
-    
+
+    # Import lazily so running a single demo skips the other subsystems
+    from enhanced_compliance_agent import EnhancedComplianceAgent
+
     compliance_agent = EnhancedComplianceAgent()
-    
+
+    # One timestamp for the whole demo block; stamping each record with a
+    # fresh datetime.now().isoformat() is wasted work for demo payloads
+    now_iso = datetime.now().isoformat()
+
     # Example 1: Clean weather data
     print("\n1. ✅ Clean Weather Data:")
     clean_data = {
@@ -26,13 +79,16 @@ def demo_enhanced_compliance_checks():
         "humidity": 65,
         "pressure": 1013,
         "location": "Berlin",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso
     }
     
     result = compliance_agent.validate_compliance(clean_data, ['hipaa', 'gdpr'])
     print(f"   Overall Compliant: {result['overall_compliant']}")
-    for regulation, check_result in result['regulation_results'].items():
-        print(f"   {regulation.upper()}: {len(check_result['violations'])} violations")
+    # Tally all regulations in one pass, then print from the counts
+    violation_counts = {regulation: len(check_result['violations'])
+                        for regulation, check_result in result['regulation_results'].items()}
+    for regulation, count in violation_counts.items():
+        print(f"   {regulation.upper()}: {count} violations")
     
     # Example 2: Data with potential PHI
     print("\n2. ⚠️  Data with Potential PHI:")
@@ -69,10 +125,13 @@ def demo_enhanced_compliance_checks():
     
     return compliance_agent
 
+@_buffered_output
 def demo_enhanced_reasoning():
     """Demonstrate enhanced reasoning capabilities"""
     print("\n=== ENHANCED REASONING DEMO ===")
-    
+
+    from enhanced_reasoning_agent import EnhancedReasoningAgent
+
     reasoning_agent = EnhancedReasoningAgent()
     
     # Example 1: Weather analysis with chain of thought
@@ -125,10 +184,13 @@ def demo_enhanced_reasoning():
     for pattern in result['identified_patterns']['correlations']:
         print(f"     - {pattern}")
 
+@_buffered_output
 def demo_memory_and_learning():
     """Demonstrate memory system learning capabilities"""
     print("\n=== MEMORY AND LEARNING DEMO ===")
-    
+
+    from memory_system import EnhancedMemorySystem
+
     memory_system = EnhancedMemorySystem("demo_memory.db")
     
     # Simulate some system usage
@@ -141,22 +203,25 @@ def demo_memory_and_learning():
     ]
     
     print("Simulating query history...")
+    # Batch the query log into one transaction instead of one commit per query
+    memory_system.log_queries_batch([(query, success, 0.0) for query, success in queries])
+
+    # Accumulate performance metrics column-wise and flush in one transaction
+    performance_records = []
     for query, success in queries:
-        memory_system.log_query(query, success)
-        # Add some performance metrics
-        memory_system.update_agent_performance("retrieval_agent", "data_fetch", success, 1.5)
-        memory_system.update_agent_performance("reasoning_agent", "analysis", success, 2.0)
-    
-    # Log some compliance violations
+        performance_records.append(("retrieval_agent", "data_fetch", success, 1.5))
+        performance_records.append(("reasoning_agent", "analysis", success, 2.0))
+    memory_system.update_agent_performance_batch(performance_records)
+
+    # Log some compliance violations in a single transaction
     compliance_issues = [
         ("hipaa", "SSN detected in patient records", "high"),
         ("gdpr", "Email collection without proper consent", "medium"),
         ("hipaa", "Medical diagnosis in unencrypted field", "high"),
         ("data_retention", "User data older than 2 years found", "low")
     ]
-    
-    for violation_type, description, severity in compliance_issues:
-        memory_system.log_compliance_violation(violation_type, description, severity)
+
+    memory_system.log_violations_batch(compliance_issues)
     
     # Store some system insights
     memory_system.store_system_insight('performance', {'avg_response_time': 1.2, 'success_rate': 0.85}, 0.9)
@@ -189,10 +254,13 @@ def demo_memory_and_learning():
     for insight in recent_insights:
         print(f"     {insight['type']}: {insight['data']} (confidence: {insight['confidence']:.2f})")
 
+@_buffered_output
 def demo_end_to_end_system():
     """Demonstrate complete system operation"""
     print("\n=== END-TO-END SYSTEM DEMO ===")
-    
+
+    from main import EnhancedComplianceAwareAgentSystem
+
     system = EnhancedComplianceAwareAgentSystem("e2e_demo.db")
     
     # Example queries demonstrating different scenarios
@@ -204,54 +272,80 @@ def demo_end_to_end_system():
         "Provide customer behavior insights from sales data"
     ]
     
-    for i, query in enumerate(demo_queries, 1):
-        print(f"\n--- Query {i}: {query} ---")
-        
-        start_time = time.time()
-        result = system.process_query(query)
-        processing_time = time.time() - start_time
-        
-        if result['success']:
-            print("✅ Query processed successfully")
-            print(f"   Retrieved {len(result['retrieved_data'])} data fields")
-            
-            # Show reasoning insights
-            insights = result['insights']['structured_insights']
-            print(f"   Confidence: {insights['confidence_score']:.2f}")
-            print(f"   Response: {insights['query_response']}")
-            
-            # Show compliance results
-            compliance = result['compliance_check']
-            status = "🟢 COMPLIANT" if compliance['overall_compliant'] else "🔴 NON-COMPLIANT"
-            print(f"   Compliance: {status}")
-            
-            if not compliance['overall_compliant']:
-                print(f"   Violations: {compliance['summary']['total_violations']}")
-            
-            # Show performance metrics
-            metrics = result['performance_metrics']
-            print(f"   Processing time: {metrics['total_processing_time']:.2f}s")
-            print(f"   Efficiency score: {metrics['efficiency_score']:.2f}")
-            
-            # Show recommendations
-            if result['system_recommendations']:
-                print(f"   Recommendations: {result['system_recommendations'][0]}")
-        else:
-            print("❌ Query failed")
-            print(f"   Error: {result.get('error', 'Unknown error')}")
-    
+    # Normalize each query once up front; the cache key (and any repeat runs)
+    # reuse the precomputed form instead of re-lowering per call
+    prepped_queries = [(query, query.lower().strip()) for query in demo_queries]
+
+    timings_ns = []
+
+    def _timed_query(query, normalized):
+        # perf_counter_ns avoids wall-clock resolution limits; aggregate once after the loop
+        t0 = time.perf_counter_ns()
+        result = _cached_process_query(system, query, normalized)
+        return result, time.perf_counter_ns() - t0
+
+    # The demo queries are independent and I/O-bound, so fan them out over a
+    # thread pool; total wall-time approaches the slowest query instead of
+    # the sum. Results print in completion order.
+    with ThreadPoolExecutor(max_workers=min(len(demo_queries), 8)) as executor:
+        futures = {executor.submit(_timed_query, query, normalized): (i, query)
+                   for i, (query, normalized) in enumerate(prepped_queries, 1)}
+        for future in as_completed(futures):
+            i, query = futures[future]
+            result, elapsed_ns = future.result()
+            timings_ns.append(elapsed_ns)
+            _print_query_result(i, query, result)
+
+    # Post-process timings in one pass
+    timings_ms = sorted(t / 1e6 for t in timings_ns)
+    percentiles = statistics.quantiles(timings_ms, n=100)
+    print(f"\n⏱️ Query latency: p50={percentiles[49]:.1f}ms "
+          f"p95={percentiles[94]:.1f}ms p99={percentiles[98]:.1f}ms")
+
     # Show system analytics after processing
     print("\n=== SYSTEM ANALYTICS ===")
     analytics = system.get_system_analytics()
-    
+
     print(f"Overall System Health: {analytics['system_health']['status']} ({analytics['system_health']['score']}/100)")
     print(f"Success Rate: {analytics['system_health']['success_rate']}%")
     print(f"Compliance Rate: {analytics['system_health']['compliance_rate']}%")
-    
+
     print("\nTop Recommendations:")
     for i, recommendation in enumerate(analytics['recommendations'][:3], 1):
         print(f"  {i}. {recommendation}")
 
+def _print_query_result(i, query, result):
+    """Print the outcome of a single end-to-end demo query"""
+    print(f"\n--- Query {i}: {query} ---")
+
+    # Bind each nested section once so the format below does a single dict
+    # lookup per field instead of re-walking the result tree
+    if result['success']:
+        insights = result['insights']['structured_insights']
+        compliance = result['compliance_check']
+        metrics = result['performance_metrics']
+        recommendations = result['system_recommendations']
+
+        status = "🟢 COMPLIANT" if compliance['overall_compliant'] else "🔴 NON-COMPLIANT"
+        lines = (
+            "✅ Query processed successfully\n"
+            f"   Retrieved {len(result['retrieved_data'])} data fields\n"
+            f"   Confidence: {insights['confidence_score']:.2f}\n"
+            f"   Response: {insights['query_response']}\n"
+            f"   Compliance: {status}"
+        )
+        if not compliance['overall_compliant']:
+            lines += f"\n   Violations: {compliance['summary']['total_violations']}"
+        lines += (
+            f"\n   Processing time: {metrics['total_processing_time']:.2f}s"
+            f"\n   Efficiency score: {metrics['efficiency_score']:.2f}"
+        )
+        if recommendations:
+            lines += f"\n   Recommendations: {recommendations[0]}"
+        print(lines)
+    else:
+        print(f"❌ Query failed\n   Error: {result.get('error', 'Unknown error')}")
+
 def run_comprehensive_demo():
     """Run all demonstration scenarios"""
     print("🚀 COMPREHENSIVE ENHANCED MULTI-AGENT SYSTEM DEMO")
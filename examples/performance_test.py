@@ -7,6 +7,8 @@ import time
 import statistics
 import sys
 import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 # Add src to path
@@ -14,14 +16,34 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from main import EnhancedComplianceAwareAgentSystem
 
-def run_performance_tests():
+# Per-process system built by the pool initializer; SQLite connections
+# don't pickle, so each worker owns its own instance and database file
+_worker_system = None
+
+def _init_worker(db_dir):
+    """Build one system per worker process inside a shared temp directory"""
+    global _worker_system
+    db_path = os.path.join(db_dir, f"perf_worker_{os.getpid()}.db")
+    _worker_system = EnhancedComplianceAwareAgentSystem(db_path)
+
+def _run_one(query):
+    """Time a single query in the worker's system"""
+    start_time = time.time()
+    result = _worker_system.process_query(query)
+    processing_time = time.time() - start_time
+
+    success = result['success']
+    compliant = success and result['compliance_check']['overall_compliant']
+    return processing_time, success, compliant
+
+def run_performance_tests(serial: bool = False):
     """Run comprehensive performance tests"""
     print("🔧 PERFORMANCE TESTING SUITE")
     print("=" * 60)
-    
+
     # Initialize system with test database
     system = EnhancedComplianceAwareAgentSystem("performance_test.db")
-    
+
     # Test queries covering different scenarios
     test_queries = [
         "Weather in London",
@@ -29,12 +51,15 @@ def run_performance_tests():
         "Analyze weather patterns for outdoor events",
         "Patient health monitoring analysis",
     ]
-    
+
     print(f"Running performance tests with {len(test_queries)} queries...")
     print()
-    
+
     # Test individual query performance
-    individual_results = test_individual_queries(system, test_queries)
+    if serial:
+        individual_results = test_individual_queries(system, test_queries)
+    else:
+        individual_results = test_individual_queries_parallel(test_queries)
     
     # Test batch processing performance
     batch_results = test_batch_processing(system, test_queries)
@@ -82,6 +107,40 @@ def test_individual_queries(system, queries):
     
     return results
 
+def test_individual_queries_parallel(queries):
+    """Test individual queries across a process pool
+
+    The queries are independent, so wall-clock time collapses toward the
+    slowest one instead of their sum. Use --serial for an apples-to-apples
+    single-process measurement.
+    """
+    print("📊 INDIVIDUAL QUERY PERFORMANCE (parallel)")
+    print("-" * 40)
+
+    results = {
+        'times': [],
+        'success_rates': [],
+        'compliance_rates': [],
+    }
+
+    workers = min(len(queries), os.cpu_count() or 1)
+    with tempfile.TemporaryDirectory() as db_dir, \
+            ProcessPoolExecutor(max_workers=workers,
+                                initializer=_init_worker,
+                                initargs=(db_dir,)) as executor:
+        outcomes = list(executor.map(_run_one, queries))
+
+    for i, (query, (processing_time, success, compliant)) in enumerate(zip(queries, outcomes), 1):
+        results['times'].append(processing_time)
+        results['success_rates'].append(int(success))
+        results['compliance_rates'].append(int(compliant))
+
+        status = "✅" if success else "❌"
+        print(f"  Query {i}: {query[:40]}...")
+        print(f"    {status} {processing_time:.2f}s")
+
+    return results
+
 def test_batch_processing(system, queries):
     """Test batch processing performance"""
     print(f"\n🔄 BATCH PROCESSING PERFORMANCE")
@@ -160,7 +219,7 @@ if __name__ == "__main__":
     print("=" * 60)
     
     try:
-        run_performance_tests()
+        run_performance_tests(serial='--serial' in sys.argv)
         
         print(f"\n{'='*60}")
         print("🎉 PERFORMANCE TESTING COMPLETED SUCCESSFULLY!")
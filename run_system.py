@@ -4,6 +4,7 @@
 Main entry point for the Compliance-Aware Multi-Agent System
 """
 
+import functools
 import sys
 import os
 
@@ -12,6 +13,16 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from main import EnhancedComplianceAwareAgentSystem
 
+@functools.lru_cache(maxsize=4)
+def get_system(db_path: str = "agent_memory.db") -> EnhancedComplianceAwareAgentSystem:
+    """Return a shared system instance for a database path
+
+    Construction opens SQLite, creates the schema, and primes the agent
+    caches; entry points that run back to back reuse one instance per path
+    instead of repeating that cold start.
+    """
+    return EnhancedComplianceAwareAgentSystem(db_path)
+
 def main():
     """Main function to run the system"""
     print("🚀 Compliance-Aware Multi-Agent System")
@@ -48,7 +59,7 @@ def run_examples():
 
 def run_interactive_mode():
     """Run system in interactive mode"""
-    system = EnhancedComplianceAwareAgentSystem()
+    system = get_system()
     print("\n💬 Interactive Mode - Type 'quit' to exit")
     print("Enter your queries below:")
     
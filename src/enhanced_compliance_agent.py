@@ -1,51 +1,178 @@
 # src/enhanced_compliance_agent.py
+import asyncio
+import copy
+import hashlib
 import re
 import json
+import time
+import itertools
+import threading
+from collections import Counter, OrderedDict, deque
 from datetime import datetime
 from typing import Dict, Any, List
 
+try:
+    # orjson serializes nested dicts several times faster than stdlib json
+    # and emits bytes directly, which is what the sha1 cache keying wants
+    import orjson
+
+    def _dumps_sorted(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS, default=str)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps_sorted(obj) -> bytes:
+        return json.dumps(obj, sort_keys=True, default=str).encode()
+
+    _loads = json.loads
+
+# Canonical PHI keyword table: keyword -> category. The cheap substring
+# prefilter, the fused scan alternation, and the violation messages all
+# derive from this one table, so extending coverage is a single entry here.
+_PHI_KEYWORDS = {
+    'cancer': 'medical',
+    'diabetes': 'medical',
+    'HIV': 'medical',
+    'AIDS': 'medical',
+    'treatment': 'medical',
+    'diagnosis': 'medical',
+    'hypertension': 'medical',
+    'hospital': 'facility',
+    'clinic': 'facility',
+    'medical center': 'facility',
+    'physician': 'facility',
+    'doctor': 'facility',
+}
+
+# Trigger substrings for the HIPAA keyword scans: if none of them appear in
+# the serialized payload, the per-field keyword regexes cannot match and the
+# scan is skipped — most payloads are clean, so this is the common fast path.
+_HIPAA_TRIGGER_TERMS = tuple(keyword.lower() for keyword in _PHI_KEYWORDS)
+
+def _phi_alternation() -> str:
+    """Build the category-grouped alternation from the keyword table"""
+    groups = []
+    for category in ('medical', 'facility'):
+        words = '|'.join(re.escape(keyword)
+                         for keyword, cat in _PHI_KEYWORDS.items() if cat == category)
+        groups.append(f'(?P<{category}>{words})')
+    return r'\b(?:' + '|'.join(groups) + r')\b'
+# Field-name term tables, hoisted so the per-field loops stop rebuilding
+# throwaway lists. Tuples for the ordered substring probes, frozensets for
+# exact-membership tests.
+_HIPAA_ID_TERMS = ('patient', 'medical', 'health')
+_HIPAA_VITAL_WHITELIST = frozenset({'temperature', 'heart_rate'})
+_RETENTION_TIME_TERMS = ('date', 'timestamp', 'time', 'created', 'last')
+
+# Violation/warning message templates, centralized so the scan loops and any
+# future deferred-formatting scheme share one source of truth
+_MSG_TEMPLATES = {
+    'ssn': "Potential SSN found in {}",
+    'medical': "Medical terminology found in {}",
+    'facility': "Healthcare facility mention in {}",
+    'patient_id': "Potential patient identifier in field: {}",
+    'pii': "Potential {} found in data",
+    'retention_violation': "Data in {} exceeds retention period ({} days old)",
+    'retention_warning': "Data in {} approaching retention limit ({} days old)",
+}
+
+_DIGITS = '0123456789'
+
+def _digit_count(s: str) -> int:
+    """Count ASCII digits via str.count's C-level memory scan
+
+    Ten sequential passes over the buffer beat one interpreted
+    per-character loop by a wide margin, and the result lets callers skip
+    numeric regexes (SSN, phone, IP) on payloads that cannot match them.
+    """
+    return sum(s.count(d) for d in _DIGITS)
+
 class EnhancedComplianceAgent:
+    # PHI (Protected Health Information) patterns, compiled once at class load
+    # so per-check scans skip the re-compile/cache-lookup cost entirely
+    _SSN_RE = re.compile(r'\b\d{3}-\d{2}-\d{4}\b')
+
+    # Medical-term and facility keywords fused into one alternation so each
+    # field is walked once instead of once per pattern; named groups tell the
+    # scan loop which category fired. Compiled from the _PHI_KEYWORDS table.
+    _HIPAA_KEYWORDS_RE = re.compile(_phi_alternation(), re.IGNORECASE)
+
+    # Personal data patterns for GDPR checks, likewise fused so the serialized
+    # payload gets a single scan pass for all three data types
+    _GDPR_FUSED_RE = re.compile(
+        r'\b(?:(?P<email>[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})'
+        r'|(?P<ip_address>(?:\d{1,3}\.){3}\d{1,3})'
+        r'|(?P<phone>(\+?(\d{1,3})?[\s-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}))\b')
+    _GDPR_DATA_TYPES = ('email', 'phone', 'ip_address')
+
+    # Shape filter for retention timestamps - anything parseable by
+    # fromisoformat starts with a YYYY-MM-DD prefix
+    _ISO_DATE_PREFIX_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+    _DECISION_CACHE_MAX = 512
+
     def __init__(self):
         self.compliance_rules = {
             'hipaa': self._check_hipaa_compliance,
             'gdpr': self._check_gdpr_compliance,
             'data_retention': self._check_data_retention
         }
-        self.compliance_log = []
+        # Bounded ring buffer: long benchmark runs otherwise grow the log
+        # (and its embedded data samples) without limit. Lifetime totals
+        # live in the counters below since len() only sees retained records.
+        self.compliance_log = deque(maxlen=10_000)
+        self._total_checks = 0
+        self._compliant_checks = 0
+        self._total_violations = 0
+        self._total_warnings = 0
+
+        # Per-instance LRU of (payload_hash, regulations) -> check result
+        self._decision_cache: OrderedDict = OrderedDict()
+        self._cache_hits = 0
+
+        # Guards the decision cache and the counters above: the agent is
+        # shared across the phase executor and batch worker threads, and
+        # OrderedDict get/move_to_end/popitem and the read-modify-write
+        # counter updates are not atomic. Checker execution itself runs
+        # outside the lock.
+        self._state_lock = threading.Lock()
+
+        # Rolling per-type violation counts so most-common lookups stay O(1)
+        # instead of re-scanning the whole log
+        self._violation_counter = Counter()
+
+        # Resolved (regulation, checker) sequences per regulation tuple;
+        # only a handful of combinations ever occur, so dispatch-table
+        # lookups and membership tests happen once per combination
+        self._checker_memo: Dict[tuple, tuple] = {}
         
-    def _check_hipaa_compliance(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _check_hipaa_compliance(self, data: Dict[str, Any], data_str: str) -> Dict[str, Any]:
         """Check for HIPAA compliance violations"""
         violations = []
         warnings = []
-        
-        # PHI (Protected Health Information) patterns
-        phi_patterns = {
-            'ssn': r'\b\d{3}-\d{2}-\d{4}\b',
-            'medical_terms': r'\b(cancer|diabetes|HIV|AIDS|treatment|diagnosis|hypertension)\b',
-            'healthcare_facilities': r'\b(hospital|clinic|medical center|physician|doctor)\b'
-        }
-        
-        data_str = json.dumps(data).lower()
-        
+
+        data_str = data_str.lower()
+
+        # Pre-filter on the serialized payload: only run the per-field
+        # regexes that can possibly match. An SSN needs nine digits; the
+        # keyword scans need at least one trigger term somewhere.
+        scan_ssn = _digit_count(data_str) >= 9
+        scan_keywords = any(term in data_str for term in _HIPAA_TRIGGER_TERMS)
+
+        # Bind the helper once; the loop body then skips the
+        # attribute/descriptor lookup on every field
+        scan_field = self._scan_field_hipaa
+
         for field_name, field_value in data.items():
             # Check for potential PHI in field values
-            if isinstance(field_value, str):
-                # SSN detection
-                if re.search(phi_patterns['ssn'], field_value):
-                    violations.append(f"Potential SSN found in {field_name}")
-                
-                # Medical terms detection
-                if re.search(phi_patterns['medical_terms'], field_value.lower()):
-                    warnings.append(f"Medical terminology found in {field_name}")
-                
-                # Healthcare facility detection
-                if re.search(phi_patterns['healthcare_facilities'], field_value.lower()):
-                    warnings.append(f"Healthcare facility mention in {field_name}")
-            
+            scan_field(field_name, field_value, scan_ssn, scan_keywords,
+                       violations, warnings)
+
             # Check for patient identifiers
-            if any(id_term in field_name.lower() for id_term in ['patient', 'medical', 'health']):
-                if field_value and field_name not in ['temperature', 'heart_rate']:  # Allow vital signs
-                    warnings.append(f"Potential patient identifier in field: {field_name}")
+            fn_lower = field_name.lower()
+            if any(id_term in fn_lower for id_term in _HIPAA_ID_TERMS):
+                if field_value and fn_lower not in _HIPAA_VITAL_WHITELIST:  # Allow vital signs
+                    warnings.append(_MSG_TEMPLATES['patient_id'].format(field_name))
         
         return {
             'is_compliant': len(violations) == 0,
@@ -54,23 +181,56 @@ class EnhancedComplianceAgent:
             'rule_applied': 'HIPAA'
         }
     
-    def _check_gdpr_compliance(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _scan_field_hipaa(self, field_name: str, field_value,
+                          scan_ssn: bool, scan_keywords: bool,
+                          violations: List[str], warnings: List[str]) -> None:
+        """Scan one field value for PHI patterns, appending any findings
+
+        Returns immediately for non-strings via an exact type test, which
+        is the overwhelmingly common case and cheaper than isinstance's
+        subclass walk.
+        """
+        if type(field_value) is not str:
+            return
+
+        # SSN detection
+        if scan_ssn and self._SSN_RE.search(field_value):
+            violations.append(_MSG_TEMPLATES['ssn'].format(field_name))
+
+        # Medical-term and facility detection in one pass over the field
+        # (the pattern is case-insensitive, so no .lower() copy is needed)
+        if scan_keywords:
+            seen_medical = seen_facility = False
+            for match in self._HIPAA_KEYWORDS_RE.finditer(field_value):
+                if match.lastgroup == 'medical':
+                    seen_medical = True
+                else:
+                    seen_facility = True
+                if seen_medical and seen_facility:
+                    break
+            if seen_medical:
+                warnings.append(_MSG_TEMPLATES['medical'].format(field_name))
+            if seen_facility:
+                warnings.append(_MSG_TEMPLATES['facility'].format(field_name))
+
+    def _check_gdpr_compliance(self, data: Dict[str, Any], data_str: str) -> Dict[str, Any]:
         """Check for GDPR compliance violations"""
         violations = []
         warnings = []
-        
-        # Personal data patterns
-        personal_data_patterns = {
-            'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-            'phone': r'\b(\+?(\d{1,3})?[\s-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}\b',
-            'ip_address': r'\b(?:\d{1,3}\.){3}\d{1,3}\b'
-        }
-        
-        data_str = json.dumps(data)
-        
-        for data_type, pattern in personal_data_patterns.items():
-            if re.search(pattern, data_str):
-                violations.append(f"Potential {data_type.upper()} found in data")
+
+        # One fused scan over the serialized payload for all personal-data
+        # types, skipped entirely when the payload cannot hold any of them:
+        # emails need '@', and the shortest numeric pattern (an IP) needs
+        # at least four digits. Stop once every category has been observed.
+        found = set()
+        if '@' in data_str or _digit_count(data_str) >= 4:
+            for match in self._GDPR_FUSED_RE.finditer(data_str):
+                found.add(match.lastgroup)
+                if len(found) == len(self._GDPR_DATA_TYPES):
+                    break
+        for data_type in self._GDPR_DATA_TYPES:
+            if data_type in found:
+                violations.append(_MSG_TEMPLATES['pii'].format(data_type.upper()))
         
         # Data minimization check
         data_size = len(data_str)
@@ -93,34 +253,42 @@ class EnhancedComplianceAgent:
             'rule_applied': 'GDPR'
         }
     
-    def _check_data_retention(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _check_data_retention(self, data: Dict[str, Any], data_str: str) -> Dict[str, Any]:
         """Check data retention compliance"""
         violations = []
         warnings = []
         
         # Check if data contains timestamps older than retention period
         retention_period_days = 30  # Example: 30-day retention
-        
+        warning_threshold_days = retention_period_days * 0.7  # Warning at 70%
+
+        # Phase 1: collect parsed (key, date) candidates. The prefix regex
+        # filters non-date strings before the exception-prone parse, and
+        # keeping the parse loop tight leaves classification branch-free.
+        dated_fields = []
         for key, value in data.items():
-            if any(time_term in key.lower() for time_term in ['date', 'timestamp', 'time', 'created', 'last']):
-                if isinstance(value, str):
+            if any(time_term in key.lower() for time_term in _RETENTION_TIME_TERMS):
+                if isinstance(value, str) and self._ISO_DATE_PREFIX_RE.match(value):
                     try:
                         # Try to parse various date formats
                         date_str = value.replace('Z', '+00:00').split('.')[0]  # Handle milliseconds
-                        data_date = datetime.fromisoformat(date_str)
-                        days_diff = (datetime.now() - data_date).days
-                        
-                        if days_diff > retention_period_days:
-                            violations.append(
-                                f"Data in {key} exceeds retention period ({days_diff} days old)"
-                            )
-                        elif days_diff > retention_period_days * 0.7:  # Warning at 70% of retention
-                            warnings.append(
-                                f"Data in {key} approaching retention limit ({days_diff} days old)"
-                            )
-                    except (ValueError, TypeError):
-                        # If date parsing fails, continue
+                        # Drop any timezone so ages can be computed against
+                        # the naive datetime.now() in phase 2
+                        parsed = datetime.fromisoformat(date_str).replace(tzinfo=None)
+                        dated_fields.append((key, parsed))
+                    except ValueError:
+                        # Malformed beyond the prefix - skip
                         continue
+
+        # Phase 2: classify ages against the thresholds with one clock read
+        now = datetime.now()
+        for key, data_date in dated_fields:
+            days_diff = (now - data_date).days
+
+            if days_diff > retention_period_days:
+                violations.append(_MSG_TEMPLATES['retention_violation'].format(key, days_diff))
+            elif days_diff > warning_threshold_days:
+                warnings.append(_MSG_TEMPLATES['retention_warning'].format(key, days_diff))
         
         return {
             'is_compliant': len(violations) == 0,
@@ -129,42 +297,110 @@ class EnhancedComplianceAgent:
             'rule_applied': 'DATA_RETENTION'
         }
     
-    def validate_compliance(self, data: Dict[str, Any], regulations: List[str] = None) -> Dict[str, Any]:
-        """Enhanced compliance validation with multiple regulations"""
-        if regulations is None:
-            regulations = ['hipaa', 'gdpr']
-        
+    def _resolve_checkers(self, regulations: tuple) -> tuple:
+        """Resolve a regulation tuple to its (name, checker) sequence once"""
+        checkers = self._checker_memo.get(regulations)
+        if checkers is None:
+            checkers = tuple((regulation, self.compliance_rules[regulation])
+                             for regulation in regulations
+                             if regulation in self.compliance_rules)
+            self._checker_memo[regulations] = checkers
+        return checkers
+
+    def _validate_cached(self, payload_hash: str, regulations: tuple, payload_json: bytes) -> Dict[str, Any]:
+        """Run the regulation checks for a content-addressed payload.
+
+        Keyed on the payload hash and regulation tuple so identical payloads
+        skip the regex-based scanning entirely on repeat validations. The
+        cache is a per-instance LRU: unlike functools.lru_cache on a method
+        it neither pins the agent alive nor retains payload bytes as keys,
+        and cached entries are returned as deep copies so callers cannot
+        poison later hits by mutating the result.
+        """
+        key = (payload_hash, regulations)
+        with self._state_lock:
+            cached = self._decision_cache.get(key)
+            if cached is not None:
+                self._decision_cache.move_to_end(key)
+                self._cache_hits += 1
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        data = _loads(payload_json)
+        # One shared serialization for every checker; each previously ran its
+        # own json.dumps over the same dict
+        data_str = payload_json.decode()
+
         results = {}
         overall_compliant = True
         all_violations = []
         all_warnings = []
-        
-        for regulation in regulations:
-            if regulation in self.compliance_rules:
-                result = self.compliance_rules[regulation](data)
-                results[regulation] = result
-                
-                if not result['is_compliant']:
-                    overall_compliant = False
-                
-                all_violations.extend(result['violations'])
-                all_warnings.extend(result['warnings'])
-        
-        # Log compliance check
+
+        for regulation, checker in self._resolve_checkers(regulations):
+            result = checker(data, data_str)
+            results[regulation] = result
+
+            if not result['is_compliant']:
+                overall_compliant = False
+
+            all_violations.extend(result['violations'])
+            all_warnings.extend(result['warnings'])
+
+        checked = {
+            'regulation_results': results,
+            'overall_compliant': overall_compliant,
+            'all_violations': all_violations,
+            'all_warnings': all_warnings
+        }
+
+        with self._state_lock:
+            self._decision_cache[key] = checked
+            if len(self._decision_cache) > self._DECISION_CACHE_MAX:
+                self._decision_cache.popitem(last=False)  # Evict least recently used
+
+        return copy.deepcopy(checked)
+
+    def validate_compliance(self, data: Dict[str, Any], regulations: List[str] = None) -> Dict[str, Any]:
+        """Enhanced compliance validation with multiple regulations"""
+        if regulations is None:
+            regulations = ['hipaa', 'gdpr']
+
+        # Content-addressed cache key: identical payloads checked against the
+        # same regulation set reuse the previous scan result.
+        payload_json = _dumps_sorted(data)
+        payload_hash = hashlib.sha1(payload_json).hexdigest()
+        checked = self._validate_cached(payload_hash, tuple(sorted(regulations)), payload_json)
+
+        results = checked['regulation_results']
+        overall_compliant = checked['overall_compliant']
+        all_violations = checked['all_violations']
+        all_warnings = checked['all_warnings']
+
+        # Log compliance check. Timestamps are raw time_ns() ints: one
+        # syscall and no strftime/locale machinery per check; format to ISO
+        # lazily at display time if ever needed.
+        check_ns = time.time_ns()
         compliance_record = {
-            'timestamp': datetime.now().isoformat(),
-            'data_sample': {k: str(v)[:100] for k, v in list(data.items())[:3]},  # Sample for logging
+            'timestamp_ns': check_ns,
+            'data_sample': {k: str(v)[:100] for k, v in itertools.islice(data.items(), 3)},  # Sample for logging
             'results': results,
             'overall_compliant': overall_compliant,
             'total_violations': len(all_violations),
             'total_warnings': len(all_warnings)
         }
-        self.compliance_log.append(compliance_record)
-        
+        with self._state_lock:
+            self.compliance_log.append(compliance_record)
+            self._violation_counter.update(v.split(' ')[0] for v in all_violations)
+            self._total_checks += 1
+            self._compliant_checks += overall_compliant
+            self._total_violations += len(all_violations)
+            self._total_warnings += len(all_warnings)
+
         return {
             'overall_compliant': overall_compliant,
             'regulation_results': results,
-            'compliance_id': f"COMP_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            'payload_hash': payload_hash,  # Audit-trail traceability for cached checks
+            'compliance_id': f"COMP_{check_ns}",
             'summary': {
                 'total_violations': len(all_violations),
                 'total_warnings': len(all_warnings),
@@ -173,38 +409,126 @@ class EnhancedComplianceAgent:
             }
         }
     
+    async def validate_compliance_async(self, data: Dict[str, Any],
+                                        regulations: List[str] = None) -> Dict[str, Any]:
+        """Validate compliance without blocking the caller's event loop
+
+        Each regulation check is CPU-bound and independent, so they are
+        dispatched to worker threads and awaited as a TaskGroup — total
+        latency collapses to the slowest checker. Cached payloads never
+        spawn a thread. Response shape, logging, and stats match the
+        synchronous path exactly.
+        """
+        if regulations is None:
+            regulations = ['hipaa', 'gdpr']
+
+        payload_json = _dumps_sorted(data)
+        payload_hash = hashlib.sha1(payload_json).hexdigest()
+        regs_tuple = tuple(sorted(regulations))
+
+        if (payload_hash, regs_tuple) not in self._decision_cache:
+            data_str = payload_json.decode()
+            async with asyncio.TaskGroup() as tg:
+                tasks = {
+                    regulation: tg.create_task(asyncio.to_thread(checker, data, data_str))
+                    for regulation, checker in self._resolve_checkers(regs_tuple)
+                }
+
+            results = {regulation: task.result() for regulation, task in tasks.items()}
+            all_violations = [v for r in results.values() for v in r['violations']]
+            all_warnings = [w for r in results.values() for w in r['warnings']]
+
+            with self._state_lock:
+                self._decision_cache[(payload_hash, regs_tuple)] = {
+                    'regulation_results': results,
+                    'overall_compliant': all(r['is_compliant'] for r in results.values()),
+                    'all_violations': all_violations,
+                    'all_warnings': all_warnings
+                }
+                if len(self._decision_cache) > self._DECISION_CACHE_MAX:
+                    self._decision_cache.popitem(last=False)
+
+        # The cache is now warm, so the synchronous path does the (cheap)
+        # logging and response assembly without re-scanning anything
+        return self.validate_compliance(data, regulations)
+
+    def validate_compliance_batch(self, data_list: List[Dict[str, Any]],
+                                  regulations: List[str] = None) -> List[Dict[str, Any]]:
+        """Validate many payloads against the same regulation set in one call
+
+        Hoists the per-call setup (regulation tuple, timestamps) out of the
+        loop and serializes each payload exactly once; duplicate payloads
+        within the batch are served from the content-addressed cache after
+        the first scan.
+        """
+        if regulations is None:
+            regulations = ['hipaa', 'gdpr']
+
+        regs_tuple = tuple(sorted(regulations))
+        batch_ns = time.time_ns()
+
+        responses = []
+        for index, data in enumerate(data_list):
+            payload_json = _dumps_sorted(data)
+            payload_hash = hashlib.sha1(payload_json).hexdigest()
+            checked = self._validate_cached(payload_hash, regs_tuple, payload_json)
+
+            all_violations = checked['all_violations']
+            all_warnings = checked['all_warnings']
+
+            with self._state_lock:
+                self.compliance_log.append({
+                    'timestamp_ns': batch_ns,
+                    'data_sample': {k: str(v)[:100] for k, v in itertools.islice(data.items(), 3)},
+                    'results': checked['regulation_results'],
+                    'overall_compliant': checked['overall_compliant'],
+                    'total_violations': len(all_violations),
+                    'total_warnings': len(all_warnings)
+                })
+                self._violation_counter.update(v.split(' ')[0] for v in all_violations)
+                self._total_checks += 1
+                self._compliant_checks += checked['overall_compliant']
+                self._total_violations += len(all_violations)
+                self._total_warnings += len(all_warnings)
+
+            responses.append({
+                'overall_compliant': checked['overall_compliant'],
+                'regulation_results': checked['regulation_results'],
+                'payload_hash': payload_hash,
+                'compliance_id': f"COMP_{batch_ns}_{index}",
+                'summary': {
+                    'total_violations': len(all_violations),
+                    'total_warnings': len(all_warnings),
+                    'violations': all_violations[:5],
+                    'warnings': all_warnings[:5]
+                }
+            })
+
+        return responses
+
     def get_compliance_stats(self) -> Dict[str, Any]:
         """Get compliance checking statistics"""
-        if not self.compliance_log:
-            return {"total_checks": 0, "compliance_rate": 1.0}
-        
-        total_checks = len(self.compliance_log)
-        compliant_checks = sum(1 for record in self.compliance_log if record['overall_compliant'])
-        
-        return {
-            "total_checks": total_checks,
-            "compliance_rate": compliant_checks / total_checks,
-            "recent_checks": self.compliance_log[-5:],
-            "most_common_violation": self._get_most_common_violation()
-        }
+        # Snapshot under the lock so the counters and log tail are mutually
+        # consistent even while checks run on other threads
+        with self._state_lock:
+            if not self._total_checks:
+                return {"total_checks": 0, "compliance_rate": 1.0}
+
+            # Lifetime counters survive ring-buffer eviction; deques don't
+            # support negative slicing, so islice from the tail
+            recent_start = max(0, len(self.compliance_log) - 5)
+            return {
+                "total_checks": self._total_checks,
+                "compliance_rate": self._compliant_checks / self._total_checks,
+                "total_violations": self._total_violations,
+                "total_warnings": self._total_warnings,
+                "recent_checks": list(itertools.islice(self.compliance_log, recent_start, None)),
+                "most_common_violation": self._get_most_common_violation()
+            }
     
     def _get_most_common_violation(self) -> str:
         """Get most common violation type"""
-        if not self.compliance_log:
+        if not self._violation_counter:
             return "none"
-        
-        violations = []
-        for record in self.compliance_log:
-            for regulation, result in record['results'].items():
-                violations.extend(result['violations'])
-        
-        if not violations:
-            return "none"
-        
-        # Count violation types
-        violation_types = {}
-        for violation in violations:
-            v_type = violation.split(' ')[0]  # Simple type extraction
-            violation_types[v_type] = violation_types.get(v_type, 0) + 1
-        
-        return max(violation_types.items(), key=lambda x: x[1])[0]
\ No newline at end of file
+
+        return self._violation_counter.most_common(1)[0][0]
\ No newline at end of file
@@ -1,39 +1,177 @@
 # src/enhanced_reasoning_agent.py
+import copy
+import functools
+import hashlib
+import itertools
 import json
+import re
+from collections import OrderedDict, defaultdict
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, NamedTuple
+
+class _DataScan(NamedTuple):
+    """Everything the reasoning steps need to know about a payload,
+    gathered in one pass instead of each step re-walking data.items()"""
+    field_types: Dict[str, str]
+    numeric_fields: Dict[str, Any]
+    categorical_values: Dict[str, set]
+    numeric_count: int
+    string_count: int
+    null_count: int
+
+# Intent categories with their trigger patterns, compiled once; order
+# matters and mirrors the original elif chain
+_INTENT_PATTERNS = (
+    ('weather_inquiry', re.compile(r'\b(?:weather|temperature|forecast)\b')),
+    ('health_analysis', re.compile(r'\b(?:patient|medical|health)\b')),
+    ('business_intelligence', re.compile(r'\b(?:sales|business|customer)\b')),
+    ('data_analysis', re.compile(r'\b(?:analyze|insight|pattern)\b')),
+)
+
+@functools.lru_cache(maxsize=1024)
+def _infer_query_intent(query_lower: str) -> str:
+    """Classify query intent; memoized since queries repeat across batches"""
+    for intent, pattern in _INTENT_PATTERNS:
+        if pattern.search(query_lower):
+            return intent
+    return "general_inquiry"
+
+def _tokenize_data(data: Dict[str, Any]) -> frozenset:
+    """Build the set of lowercase tokens a payload exposes for matching
+
+    Field names contribute both whole ('weather_condition') and split
+    ('weather', 'condition') forms so query words still hit compound keys,
+    and string values contribute their words. Membership tests against
+    this set replace substring scans over a str(data) repr.
+    """
+    return frozenset(itertools.chain(
+        (key.lower() for key in data),
+        (part for key in data for part in key.lower().split('_')),
+        (token for value in data.values() if isinstance(value, str)
+         for token in value.lower().split())
+    ))
+
+# Hash-consed reasoning steps: logically equal step dicts share a single
+# canonical instance, so repeated chains (the step templates are largely
+# static) cost one dict lookup instead of a fresh allocation each time.
+_STEP_INTERN: Dict[frozenset, Dict[str, Any]] = {}
+
+def _calculate_confidence(field_count: int, has_hypotheses: bool,
+                          data_relevance: float, quality_score: float) -> float:
+    """Score analysis confidence from scalar signals
+
+    Pure arithmetic over plain scalars - no self, no dict traversal - so
+    the interpreter runs it as straight-line float ops, and it can be
+    unit-tested or swapped without touching the agent.
+    """
+    confidence = 0.5  # Base confidence
+
+    # Increase confidence based on data richness
+    if field_count > 3:
+        confidence += 0.2
+
+    # Increase confidence if hypotheses were generated
+    if has_hypotheses:
+        confidence += 0.2
+
+    # Adjust based on data relevance, then data quality
+    confidence += (data_relevance - 0.5) * 0.3
+    confidence += (quality_score - 0.5) * 0.3
+
+    return min(max(confidence, 0.1), 1.0)  # Ensure between 0.1 and 1.0
+
+def _intern_step(step: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the canonical instance for a reasoning-step dict"""
+    key = frozenset(step.items())
+    canonical = _STEP_INTERN.get(key)
+    if canonical is None:
+        _STEP_INTERN[key] = canonical = step
+    return canonical
 
 class EnhancedReasoningAgent:
+    # Domain keyword -> payload fields whose presence boosts relevance;
+    # extend the table to add domains, no code change needed
+    _RELEVANCE_DOMAINS = {
+        'weather': frozenset({'temperature', 'humidity'}),
+    }
+
+    # Hypothesis-domain trigger terms; frozenset.isdisjoint against the
+    # tokenized query is a single C-level probe per domain instead of a
+    # substring scan per term
+    _WEATHER_TERMS = frozenset({'weather', 'temperature', 'forecast'})
+    _HEALTH_TERMS = frozenset({'patient', 'medical', 'health'})
+    _BUSINESS_TERMS = frozenset({'sales', 'business', 'customer'})
+
+    # Field -> (plausible low, plausible high, anomaly message); values
+    # outside the closed interval are flagged. New bounded fields are one
+    # table entry, not another elif branch
+    _ANOMALY_BOUNDS = {
+        'temperature': (-50, 50, "Extreme temperature value: {}"),
+        'humidity': (0, 100, "Invalid humidity value: {}"),
+    }
+
+    _ANALYSIS_CACHE_MAX = 256
+
     def __init__(self):
         self.reasoning_steps = []
         self.hypotheses = []
+        self._step_stamp = None
+
+        # Content-addressed LRU over full analysis results: the reasoning
+        # chain is deterministic for a (payload, query) pair, so replayed
+        # queries skip the five-step pipeline entirely
+        self._analysis_cache: OrderedDict = OrderedDict()
     
     def analyze_with_chain_of_thought(self, data: Dict[str, Any], query: str) -> Dict[str, Any]:
         """Perform multi-step reasoning with chain-of-thought"""
+        cache_key = (hashlib.blake2b(
+            json.dumps(data, sort_keys=True, default=str).encode(),
+            digest_size=16).digest(), query)
+        cached = self._analysis_cache.get(cache_key)
+        if cached is not None:
+            self._analysis_cache.move_to_end(cache_key)
+            result = copy.deepcopy(cached)
+            result['timestamp'] = datetime.now().isoformat()
+            self.reasoning_steps = result['reasoning_chain']
+            self.hypotheses = result['generated_hypotheses']
+            return result
+
         self.reasoning_steps = []
         self.hypotheses = []
-        
+
+        # One wall-clock read and format for the whole chain: the steps run
+        # within milliseconds of each other, and per-step strftime calls
+        # were both wasteful and defeated step interning
+        self._step_stamp = datetime.now().strftime('%H:%M:%S')
+
+        # Lowercase and tokenize the query once; every helper that needs
+        # them gets these copies instead of re-allocating its own
+        query_lower = query.lower()
+        query_tokens = frozenset(query_lower.split())
+        data_tokens = _tokenize_data(data)
+        scan = self._scan(data)
+
         # Step 1: Data Understanding
         self._add_reasoning_step("DATA_UNDERSTANDING", "Analyzing data structure and content")
-        data_insights = self._understand_data_structure(data)
+        data_insights = self._understand_data_structure(data, scan)
         
         # Step 2: Hypothesis Generation
         self._add_reasoning_step("HYPOTHESIS_GENERATION", "Generating potential insights based on data patterns")
-        hypotheses = self._generate_hypotheses(data, query)
+        hypotheses = self._generate_hypotheses(data, query_tokens, scan)
         
         # Step 3: Pattern Recognition
         self._add_reasoning_step("PATTERN_RECOGNITION", "Identifying patterns and correlations in the data")
-        patterns = self._identify_patterns(data)
+        patterns = self._identify_patterns(data, scan)
         
         # Step 4: Context Analysis
         self._add_reasoning_step("CONTEXT_ANALYSIS", "Analyzing data in the context of the query")
-        context_analysis = self._analyze_context(data, query)
+        context_analysis = self._analyze_context(data, query_lower, query_tokens, data_tokens, scan)
         
         # Step 5: Insight Synthesis
         self._add_reasoning_step("INSIGHT_SYNTHESIS", "Synthesizing final insights from all analysis steps")
         final_insights = self._synthesize_insights(data_insights, hypotheses, patterns, context_analysis, query)
         
-        return {
+        result = {
             'structured_insights': final_insights,
             'reasoning_chain': self.reasoning_steps,
             'generated_hypotheses': hypotheses,
@@ -41,6 +179,12 @@ class EnhancedReasoningAgent:
             'context_analysis': context_analysis,
             'timestamp': datetime.now().isoformat()
         }
+
+        self._analysis_cache[cache_key] = result
+        if len(self._analysis_cache) > self._ANALYSIS_CACHE_MAX:
+            self._analysis_cache.popitem(last=False)  # Evict least recently used
+
+        return copy.deepcopy(result)
     
     def _add_reasoning_step(self, step_type: str, description: str):
         """Add a step to the reasoning chain"""
@@ -48,54 +192,63 @@ class EnhancedReasoningAgent:
             'step': len(self.reasoning_steps) + 1,
             'type': step_type,
             'description': description,
-            'timestamp': datetime.now().strftime('%H:%M:%S')
+            'timestamp': self._step_stamp or datetime.now().strftime('%H:%M:%S')
         }
-        self.reasoning_steps.append(step)
+        self.reasoning_steps.append(_intern_step(step))
     
-    def _understand_data_structure(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze data structure and content"""
-        insights = {
-            'data_type': type(data).__name__,
-            'field_count': len(data),
-            'fields': list(data.keys()),
-            'field_types': {},
-            'data_quality': {}
-        }
-        
+    def _scan(self, data: Dict[str, Any]) -> _DataScan:
+        """Walk the payload once, collecting everything downstream steps need
+
+        Structure analysis, pattern detection, and the null checks in
+        hypothesis/context generation previously each ran their own pass
+        over data.items(); this fuses them into a single loop.
+        """
+        field_types = {}
+        numeric_fields = {}
+        # Sets make uniqueness a hash insert instead of an O(n) list scan
+        # per repeated value
+        categorical_values = defaultdict(set)
         numeric_count = 0
         string_count = 0
         null_count = 0
-        
+
         for key, value in data.items():
-            field_type = type(value).__name__
-            insights['field_types'][key] = field_type
-            
-            # Count types for quality assessment
+            field_types[key] = type(value).__name__
+
             if isinstance(value, (int, float)):
                 numeric_count += 1
+                numeric_fields[key] = value
             elif isinstance(value, str):
                 string_count += 1
+                categorical_values[key].add(value)
             elif value is None:
                 null_count += 1
-        
-        # Data quality assessment
-        insights['data_quality'] = {
-            'numeric_fields': numeric_count,
-            'text_fields': string_count,
-            'null_fields': null_count,
-            'completeness_score': 1 - (null_count / len(data)) if data else 1.0
+
+        return _DataScan(field_types, numeric_fields, categorical_values,
+                         numeric_count, string_count, null_count)
+
+    def _understand_data_structure(self, data: Dict[str, Any], scan: _DataScan) -> Dict[str, Any]:
+        """Analyze data structure and content"""
+        return {
+            'data_type': type(data).__name__,
+            'field_count': len(data),
+            'fields': list(data.keys()),
+            'field_types': scan.field_types,
+            'data_quality': {
+                'numeric_fields': scan.numeric_count,
+                'text_fields': scan.string_count,
+                'null_fields': scan.null_count,
+                'completeness_score': 1 - (scan.null_count / len(data)) if data else 1.0
+            }
         }
-        
-        return insights
     
-    def _generate_hypotheses(self, data: Dict[str, Any], query: str) -> List[str]:
+    def _generate_hypotheses(self, data: Dict[str, Any], query_tokens: frozenset,
+                             scan: _DataScan) -> List[str]:
         """Generate potential hypotheses based on data and query"""
         hypotheses = []
-        query_lower = query.lower()
-        data_str = str(data).lower()
-        
+
         # Weather-specific hypotheses
-        if any(term in query_lower for term in ['weather', 'temperature', 'forecast']):
+        if not self._WEATHER_TERMS.isdisjoint(query_tokens):
             temp = data.get('temperature')
             if isinstance(temp, (int, float)):
                 if temp > 30:
@@ -115,27 +268,28 @@ class EnhancedReasoningAgent:
             # Weather condition hypotheses
             condition = data.get('weather_condition')
             if condition:
-                if 'rain' in condition.lower():
+                condition = condition.lower()
+                if 'rain' in condition:
                     hypotheses.append("Precipitation expected - consider indoor alternatives")
-                elif 'snow' in condition.lower():
+                elif 'snow' in condition:
                     hypotheses.append("Snow conditions - transportation and safety considerations")
         
         # Medical/health hypotheses
-        if any(term in query_lower for term in ['patient', 'medical', 'health']):
+        if not self._HEALTH_TERMS.isdisjoint(query_tokens):
             if 'blood_pressure' in data:
                 hypotheses.append("Blood pressure data available for health monitoring")
             if 'heart_rate' in data:
                 hypotheses.append("Heart rate monitoring provides vital health insights")
         
         # Business/data analysis hypotheses
-        if any(term in query_lower for term in ['sales', 'business', 'customer']):
+        if not self._BUSINESS_TERMS.isdisjoint(query_tokens):
             if 'sales_volume' in data:
                 hypotheses.append("Sales volume trends can inform business strategy")
             if 'customer_count' in data:
                 hypotheses.append("Customer behavior patterns may reveal opportunities")
         
         # General data quality hypotheses
-        if any(value is None for value in data.values()):
+        if scan.null_count:
             hypotheses.append("Data completeness issues detected - may affect analysis accuracy")
         
         if len(data) < 3:
@@ -143,33 +297,19 @@ class EnhancedReasoningAgent:
         
         return hypotheses
     
-    def _identify_patterns(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _identify_patterns(self, data: Dict[str, Any], scan: _DataScan) -> Dict[str, Any]:
         """Identify patterns in the data"""
+        numeric_fields = scan.numeric_fields
         patterns = {
-            'numeric_ranges': {},
-            'categorical_values': {},
+            'numeric_ranges': {key: {'value': value, 'type': 'numeric'}
+                               for key, value in numeric_fields.items()},
+            'categorical_values': {key: list(values)
+                                   for key, values in scan.categorical_values.items()},
             'correlations': [],
             'anomalies': [],
             'trends': []
         }
-        
-        numeric_fields = {}
-        
-        # Analyze numeric fields
-        for key, value in data.items():
-            if isinstance(value, (int, float)):
-                numeric_fields[key] = value
-                patterns['numeric_ranges'][key] = {
-                    'value': value,
-                    'type': 'numeric'
-                }
-            
-            elif isinstance(value, str):
-                if key not in patterns['categorical_values']:
-                    patterns['categorical_values'][key] = []
-                if value not in patterns['categorical_values'][key]:
-                    patterns['categorical_values'][key].append(value)
-        
+
         # Simple correlation detection between numeric fields
         if len(numeric_fields) >= 2:
             field_names = list(numeric_fields.keys())[:3]  # Limit to first 3 for simplicity
@@ -178,15 +318,11 @@ class EnhancedReasoningAgent:
                     f"Potential relationship between {field_names[0]} and {field_names[1]}"
                 )
         
-        # Anomaly detection (simplified)
-        for field, value in numeric_fields.items():
-            if field == 'temperature' and isinstance(value, (int, float)):
-                if value > 50 or value < -50:  # Extreme temperatures
-                    patterns['anomalies'].append(f"Extreme temperature value: {value}")
-            
-            elif field == 'humidity' and isinstance(value, (int, float)):
-                if value > 100 or value < 0:  # Impossible humidity
-                    patterns['anomalies'].append(f"Invalid humidity value: {value}")
+        # Anomaly detection: probe the bounds table for each present field
+        for field, (low, high, message) in self._ANOMALY_BOUNDS.items():
+            value = numeric_fields.get(field)
+            if value is not None and (value < low or value > high):
+                patterns['anomalies'].append(message.format(value))
         
         # Trend detection (simplified)
         if 'timestamp' in data:
@@ -194,17 +330,19 @@ class EnhancedReasoningAgent:
         
         return patterns
     
-    def _analyze_context(self, data: Dict[str, Any], query: str) -> Dict[str, Any]:
+    def _analyze_context(self, data: Dict[str, Any], query_lower: str,
+                         query_tokens: frozenset, data_tokens: frozenset,
+                         scan: _DataScan) -> Dict[str, Any]:
         """Analyze data in the context of the query"""
         context = {
-            'query_intent': self._infer_query_intent(query),
-            'data_relevance': self._assess_data_relevance(data, query),
+            'query_intent': _infer_query_intent(query_lower),
+            'data_relevance': self._assess_data_relevance(data, query_lower, query_tokens, data_tokens),
             'actionable_insights': [],
             'limitations': []
         }
-        
+
         # Determine actionable insights based on data and query
-        if 'weather' in query.lower() and 'temperature' in data:
+        if 'weather' in query_lower and 'temperature' in data:
             temp = data['temperature']
             if isinstance(temp, (int, float)):
                 if temp < 10:
@@ -216,41 +354,27 @@ class EnhancedReasoningAgent:
         if len(data) < 5:
             context['limitations'].append("Limited data fields may restrict comprehensive analysis")
         
-        if any(value is None for value in data.values()):
+        if scan.null_count:
             context['limitations'].append("Missing values in dataset")
         
         return context
     
-    def _infer_query_intent(self, query: str) -> str:
-        """Infer the intent behind the query"""
-        query_lower = query.lower()
-        
-        if any(term in query_lower for term in ['weather', 'temperature', 'forecast']):
-            return "weather_inquiry"
-        elif any(term in query_lower for term in ['patient', 'medical', 'health']):
-            return "health_analysis"
-        elif any(term in query_lower for term in ['sales', 'business', 'customer']):
-            return "business_intelligence"
-        elif any(term in query_lower for term in ['analyze', 'insight', 'pattern']):
-            return "data_analysis"
-        else:
-            return "general_inquiry"
-    
-    def _assess_data_relevance(self, data: Dict[str, Any], query: str) -> float:
+    def _assess_data_relevance(self, data: Dict[str, Any], query_lower: str,
+                               query_tokens: frozenset,
+                               data_tokens: frozenset) -> float:
         """Assess how relevant the data is to the query"""
         relevance_score = 0.5  # Base score
-        
-        query_terms = query.lower().split()
-        data_terms = ' '.join(str(data).lower().split())
-        
-        # Simple term matching for relevance
-        matching_terms = sum(1 for term in query_terms if term in data_terms)
+
+        # Term matching via set intersection instead of substring scans
+        # over a full str(data) repr
+        matching_terms = len(data_tokens.intersection(query_tokens))
         relevance_score += min(matching_terms * 0.1, 0.3)  # Max 0.3 boost from term matching
-        
+
         # Boost for specific domain matches
-        if 'weather' in query.lower() and any(field in data for field in ['temperature', 'humidity']):
-            relevance_score += 0.2
-        
+        for domain, fields in self._RELEVANCE_DOMAINS.items():
+            if domain in query_lower and not fields.isdisjoint(data.keys()):
+                relevance_score += 0.2
+
         return min(relevance_score, 1.0)
     
     def _synthesize_insights(self, data_insights: Dict, hypotheses: List[str], 
@@ -260,7 +384,11 @@ class EnhancedReasoningAgent:
             'query_response': self._generate_query_response(data_insights, hypotheses, patterns, context, query),
             'data_quality_assessment': self._assess_data_quality(data_insights),
             'recommendations': self._generate_recommendations(hypotheses, patterns, context),
-            'confidence_score': self._calculate_confidence(data_insights, hypotheses, context),
+            'confidence_score': _calculate_confidence(
+                data_insights['field_count'],
+                bool(hypotheses),
+                context['data_relevance'],
+                data_insights['data_quality']['completeness_score']),
             'key_findings': self._extract_key_findings(hypotheses, patterns)
         }
         
@@ -351,23 +479,3 @@ class EnhancedReasoningAgent:
         
         return findings[:3]  # Limit to top 3 findings
     
-    def _calculate_confidence(self, data_insights: Dict, hypotheses: List[str], context: Dict) -> float:
-        """Calculate confidence score for the analysis"""
-        confidence = 0.5  # Base confidence
-        
-        # Increase confidence based on data richness
-        if data_insights['field_count'] > 3:
-            confidence += 0.2
-        
-        # Increase confidence if hypotheses were generated
-        if hypotheses:
-            confidence += 0.2
-        
-        # Adjust based on data relevance
-        confidence += (context['data_relevance'] - 0.5) * 0.3
-        
-        # Adjust based on data quality
-        quality_score = data_insights['data_quality']['completeness_score']
-        confidence += (quality_score - 0.5) * 0.3
-        
-        return min(max(confidence, 0.1), 1.0)  # Ensure between 0.1 and 1.0
\ No newline at end of file
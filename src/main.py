@@ -1,20 +1,107 @@
 # src/main.py
-import json
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, Any, List
-import traceback
 
 from retrieval_agent import RetrievalAgent
 from enhanced_reasoning_agent import EnhancedReasoningAgent
 from enhanced_compliance_agent import EnhancedComplianceAgent
 from memory_system import EnhancedMemorySystem
 
+# Violation text that marks a high-severity finding; compiled once instead
+# of substring + .lower() work per violation
+_HIGH_SEV = re.compile(r"SSN|email", re.IGNORECASE)
+
+def _calculate_efficiency_score(processing_time: float, data_size: int) -> float:
+    """Calculate processing efficiency score
+
+    Module-level and self-free: pure float arithmetic the interpreter can
+    dispatch without an attribute lookup per call.
+    """
+    # Normalize based on data size and time
+    base_efficiency = 1.0 / (processing_time + 1)  # Avoid division by zero
+    size_factor = 1.0 / (data_size / 1000 + 1)  # Normalize data size
+
+    efficiency = (base_efficiency + size_factor) / 2
+    return min(efficiency, 1.0)
+
+def _approximate_data_size(data: Dict[str, Any]) -> int:
+    """Approximate payload size from keys and values
+
+    Close enough to len(str(data)) for the size-normalized metrics below,
+    without building a throwaway repr of the entire payload each time.
+    """
+    return sum(len(key) + len(str(value)) for key, value in data.items())
+
+class StageError(Exception):
+    """A pipeline stage failed; carries which stage for error reporting"""
+
+    def __init__(self, stage: str, original: Exception):
+        super().__init__(f"{stage} stage failed: {original}")
+        self.stage = stage
+        self.original = original
+
+@dataclass(slots=True)
+class QueryInsight:
+    """Slotted holder for a learning insight awaiting persistence"""
+    insight_type: str
+    insight_data: Dict[str, Any]
+    confidence: float
+
+@dataclass(slots=True)
+class QueryResult:
+    """Slotted container for a successfully processed query
+
+    Slots keep per-result memory overhead low and make attribute access a
+    C-level lookup while the pipeline assembles the response. Callers still
+    receive the established dict shape via to_dict().
+    """
+    success: bool
+    query: str
+    retrieved_data: Dict[str, Any]
+    insights: Dict[str, Any]
+    compliance_check: Dict[str, Any]
+    performance_metrics: Dict[str, Any]
+    system_recommendations: List[str]
+    timestamp: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to the public response dict"""
+        return {
+            'success': self.success,
+            'query': self.query,
+            'retrieved_data': self.retrieved_data,
+            'insights': self.insights,
+            'compliance_check': self.compliance_check,
+            'performance_metrics': self.performance_metrics,
+            'system_recommendations': self.system_recommendations,
+            'timestamp': self.timestamp
+        }
+
 class EnhancedComplianceAwareAgentSystem:
     def __init__(self, db_path: str = "agent_memory.db"):
         self.retrieval_agent = RetrievalAgent()
         self.reasoning_agent = EnhancedReasoningAgent()
         self.compliance_agent = EnhancedComplianceAgent()
         self.memory_system = EnhancedMemorySystem(db_path)
+
+        # Small pool used to overlap independent pipeline phases per query
+        self._phase_executor = ThreadPoolExecutor(max_workers=2)
+
+        # The reasoning agent keeps its chain on instance state, so
+        # concurrent batch workers must take turns through it
+        self._reasoning_lock = threading.Lock()
+
+        # Learning insights accumulate here and flush to SQLite in bulk -
+        # when the buffer fills or when analytics are requested - instead
+        # of three inserts per query. maxlen bounds memory if flushing
+        # somehow falls behind.
+        self._insight_buffer = deque(maxlen=128)
         
         # System configuration
         self.config = {
@@ -36,19 +123,36 @@ class EnhancedComplianceAwareAgentSystem:
         Returns:
             Dictionary containing complete processing results
         """
-        start_time = datetime.now()
-        
+        # Durations come from the monotonic perf counter - no timezone
+        # conversion or formatting per stage, immune to clock adjustments
+        start_time = time.perf_counter()
+
         if regulations is None:
             regulations = self.config['default_regulations']
-        
+
+        # Batch the pipeline's memory writes (performance rows, violations,
+        # insights, the query log): each was paying its own commit/fsync.
+        # batch() is per-thread, so concurrent queries each defer their own
+        # commits; on the shared connection a commit from one thread may
+        # also flush another's in-flight writes early, which is fine for
+        # this store - the point is amortizing fsyncs, not isolation.
+        with self.memory_system.batch():
+            return self._process_query_inner(query, regulations, start_time)
+
+    def _process_query_inner(self, query: str, regulations: List[str],
+                             start_time: float) -> Dict[str, Any]:
+        """Run the pipeline; memory writes share the caller's transaction"""
         try:
             # Check historical performance for this type of query
             historical_success = self.memory_system.get_query_success_rate(query)
             
             # Step 1: Retrieve data
-            retrieval_start = datetime.now()
-            data = self.retrieval_agent.fetch_data(query)
-            retrieval_time = (datetime.now() - retrieval_start).total_seconds()
+            try:
+                retrieval_start = time.perf_counter()
+                data = self.retrieval_agent.fetch_data(query)
+                retrieval_time = time.perf_counter() - retrieval_start
+            except Exception as e:
+                raise StageError('retrieval', e) from e
             
             self.memory_system.update_agent_performance(
                 "retrieval_agent", "data_fetch", bool(data), retrieval_time
@@ -57,22 +161,34 @@ class EnhancedComplianceAwareAgentSystem:
             if not data:
                 return self._create_error_response("No data retrieved from source", start_time)
             
-            # Step 2: Reasoning with chain-of-thought
-            reasoning_start = datetime.now()
-            insights = self.reasoning_agent.analyze_with_chain_of_thought(data, query)
-            reasoning_time = (datetime.now() - reasoning_start).total_seconds()
-            
+            # Steps 2 + 3: reasoning and compliance both depend only on the
+            # retrieved data, so run them concurrently — the critical path
+            # becomes the slower of the two phases instead of their sum
+            def _timed_compliance():
+                t0 = time.perf_counter()
+                result = self.compliance_agent.validate_compliance(data, regulations)
+                return result, time.perf_counter() - t0
+
+            compliance_future = self._phase_executor.submit(_timed_compliance)
+
+            try:
+                with self._reasoning_lock:
+                    reasoning_start = time.perf_counter()
+                    insights = self.reasoning_agent.analyze_with_chain_of_thought(data, query)
+                    reasoning_time = time.perf_counter() - reasoning_start
+            except Exception as e:
+                raise StageError('reasoning', e) from e
+
+            try:
+                compliance_result, compliance_time = compliance_future.result()
+            except Exception as e:
+                raise StageError('compliance', e) from e
+
             self.memory_system.update_agent_performance(
                 "reasoning_agent", "data_analysis", True, reasoning_time
             )
-            
-            # Step 3: Compliance check
-            compliance_start = datetime.now()
-            compliance_result = self.compliance_agent.validate_compliance(data, regulations)
-            compliance_time = (datetime.now() - compliance_start).total_seconds()
-            
             self.memory_system.update_agent_performance(
-                "compliance_agent", "compliance_check", 
+                "compliance_agent", "compliance_check",
                 compliance_result['overall_compliant'], compliance_time
             )
             
@@ -80,7 +196,7 @@ class EnhancedComplianceAwareAgentSystem:
             for regulation, result in compliance_result['regulation_results'].items():
                 for violation in result.get('violations', []):
                     # Determine severity based on violation type
-                    severity = "high" if "SSN" in violation or "email" in violation.lower() else "medium"
+                    severity = "high" if _HIGH_SEV.search(violation) else "medium"
                     self.memory_system.log_compliance_violation(regulation, violation, severity)
             
             # Step 4: Generate system insights for learning
@@ -88,16 +204,16 @@ class EnhancedComplianceAwareAgentSystem:
                 self._generate_learning_insights(data, insights, compliance_result, query)
             
             # Step 5: Log successful query
-            total_time = (datetime.now() - start_time).total_seconds()
+            total_time = time.perf_counter() - start_time
             self.memory_system.log_query(query, success=True, processing_time=total_time)
             
-            return {
-                'success': True,
-                'query': query,
-                'retrieved_data': data,
-                'insights': insights,
-                'compliance_check': compliance_result,
-                'performance_metrics': {
+            return QueryResult(
+                success=True,
+                query=query,
+                retrieved_data=data,
+                insights=insights,
+                compliance_check=compliance_result,
+                performance_metrics={
                     'total_processing_time': total_time,
                     'historical_success_rate': historical_success,
                     'component_times': {
@@ -105,29 +221,41 @@ class EnhancedComplianceAwareAgentSystem:
                         'reasoning': reasoning_time,
                         'compliance': compliance_time
                     },
-                    'efficiency_score': self._calculate_efficiency_score(total_time, len(str(data)))
+                    'efficiency_score': _calculate_efficiency_score(total_time, _approximate_data_size(data))
                 },
-                'system_recommendations': self._generate_system_recommendations(insights, compliance_result),
-                'timestamp': datetime.now().isoformat()
-            }
+                system_recommendations=self._generate_system_recommendations(insights, compliance_result),
+                timestamp=datetime.now().isoformat()
+            ).to_dict()
             
         except Exception as e:
             # Log failed query
-            total_time = (datetime.now() - start_time).total_seconds()
+            total_time = time.perf_counter() - start_time
             self.memory_system.log_query(query, success=False, processing_time=total_time)
             
+            # Import lazily: traceback is only needed on the failure path,
+            # so the happy path skips loading it at module import
+            import traceback
+
+            # One wall-clock read covers the error details and the response
+            now_iso = datetime.now().isoformat()
             error_details = {
                 'error': str(e),
                 'traceback': traceback.format_exc(),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso
             }
-            
-            return self._create_error_response(f"Processing failed: {str(e)}", start_time, error_details)
+            if isinstance(e, StageError):
+                error_details['failed_stage'] = e.stage
+
+
+            return self._create_error_response(f"Processing failed: {str(e)}", start_time,
+                                               error_details, now_iso)
     
     def _generate_learning_insights(self, data: Dict[str, Any], insights: Dict[str, Any], 
                                   compliance_result: Dict[str, Any], query: str):
         """Generate and store learning insights from the processing"""
         
+        buffer = self._insight_buffer
+
         # Insight 1: Query type patterns
         query_insight = {
             'query_length': len(query),
@@ -135,8 +263,8 @@ class EnhancedComplianceAwareAgentSystem:
             'compliance_status': compliance_result['overall_compliant'],
             'reasoning_confidence': insights['structured_insights']['confidence_score']
         }
-        self.memory_system.store_system_insight('query_pattern', query_insight, 0.7)
-        
+        buffer.append(QueryInsight('query_pattern', query_insight, 0.7))
+
         # Insight 2: Compliance patterns
         if not compliance_result['overall_compliant']:
             compliance_insight = {
@@ -144,55 +272,82 @@ class EnhancedComplianceAwareAgentSystem:
                 'regulation_violations': list(compliance_result['regulation_results'].keys()),
                 'data_type': type(data).__name__
             }
-            self.memory_system.store_system_insight('compliance_pattern', compliance_insight, 0.8)
-        
+            buffer.append(QueryInsight('compliance_pattern', compliance_insight, 0.8))
+
         # Insight 3: Performance patterns
         performance_insight = {
-            'data_complexity': len(str(data)),
+            'data_complexity': _approximate_data_size(data),
             'hypotheses_generated': len(insights['generated_hypotheses']),
             'reasoning_steps': len(insights['reasoning_chain'])
         }
-        self.memory_system.store_system_insight('performance_pattern', performance_insight, 0.6)
+        buffer.append(QueryInsight('performance_pattern', performance_insight, 0.6))
+
+        if len(buffer) >= buffer.maxlen:
+            self._flush_insights()
+
+    def _flush_insights(self):
+        """Persist buffered learning insights in one transaction"""
+        if not self._insight_buffer:
+            return
+        with self.memory_system.batch():
+            while True:
+                try:
+                    insight = self._insight_buffer.popleft()
+                except IndexError:  # Another worker drained the buffer
+                    break
+                self.memory_system.store_system_insight(
+                    insight.insight_type, insight.insight_data, insight.confidence
+                )
     
     def _generate_system_recommendations(self, insights: Dict[str, Any], 
                                        compliance_result: Dict[str, Any]) -> List[str]:
-        """Generate system-level recommendations"""
+        """Generate system-level recommendations
+
+        Dedupes incrementally with a seen-set and stops at the cap of 5,
+        so nothing past the cap is generated only to be thrown away.
+        """
         recommendations = []
-        
+        seen = set()
+
+        def add(rec: str):
+            if rec not in seen:
+                seen.add(rec)
+                recommendations.append(rec)
+
         # Data quality recommendations
         data_quality = insights['structured_insights']['data_quality_assessment']
         if data_quality['completeness'] in ['fair', 'poor']:
-            recommendations.append("Consider improving data quality for more accurate insights")
-        
+            add("Consider improving data quality for more accurate insights")
+
         # Compliance recommendations
         if not compliance_result['overall_compliant']:
-            recommendations.append("Address compliance violations before production deployment")
-        
+            add("Address compliance violations before production deployment")
+
         # Reasoning recommendations
         confidence = insights['structured_insights']['confidence_score']
         if confidence < 0.6:
-            recommendations.append("Low confidence in analysis - consider additional data sources")
-        
-        # Add memory system recommendations
-        memory_recommendations = self.memory_system.get_agent_recommendations()
-        recommendations.extend(memory_recommendations)
-        
-        return list(set(recommendations))[:5]  # Remove duplicates and limit
-    
-    def _calculate_efficiency_score(self, processing_time: float, data_size: int) -> float:
-        """Calculate processing efficiency score"""
-        # Normalize based on data size and time
-        base_efficiency = 1.0 / (processing_time + 1)  # Avoid division by zero
-        size_factor = 1.0 / (data_size / 1000 + 1)  # Normalize data size
-        
-        efficiency = (base_efficiency + size_factor) / 2
-        return min(efficiency, 1.0)
+            add("Low confidence in analysis - consider additional data sources")
+
+        # Memory-system recommendations fill the remaining slots; skip the
+        # SQLite round trip entirely if the cap is already met
+        if len(recommendations) < 5:
+            for rec in self.memory_system.get_agent_recommendations():
+                add(rec)
+                if len(recommendations) == 5:
+                    break
+
+        return recommendations
     
-    def _create_error_response(self, error_message: str, start_time: datetime, 
-                             error_details: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Create standardized error response"""
-        total_time = (datetime.now() - start_time).total_seconds()
-        
+    def _create_error_response(self, error_message: str, start_time: float,
+                             error_details: Dict[str, Any] = None,
+                             now_iso: str = None) -> Dict[str, Any]:
+        """Create standardized error response
+
+        start_time is a time.perf_counter() reading taken at query start;
+        now_iso lets callers that already read the clock reuse that stamp.
+        """
+        total_time = time.perf_counter() - start_time
+
         response = {
             'success': False,
             'error': error_message,
@@ -200,7 +355,7 @@ class EnhancedComplianceAwareAgentSystem:
                 'total_processing_time': total_time,
                 'error_occurred': True
             },
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso or datetime.now().isoformat()
         }
         
         if error_details:
@@ -210,6 +365,8 @@ class EnhancedComplianceAwareAgentSystem:
     
     def get_system_analytics(self) -> Dict[str, Any]:
         """Get comprehensive system analytics"""
+        # Analytics read from SQLite, so drain any buffered insights first
+        self._flush_insights()
         memory_insights = self.memory_system.get_system_insights()
         compliance_stats = self.compliance_agent.get_compliance_stats()
         retrieval_stats = self.retrieval_agent.get_request_stats()
@@ -247,14 +404,18 @@ class EnhancedComplianceAwareAgentSystem:
     
     def batch_process_queries(self, queries: List[str]) -> Dict[str, Any]:
         """Process multiple queries in batch"""
-        results = []
         successful = 0
         total_time = 0
-        
-        for query in queries:
-            result = self.process_query(query)
-            results.append(result)
-            
+
+        # Queries are independent and spend their time in retrieval I/O and
+        # SQLite writes, so fan them out across threads. Write batching
+        # happens inside process_query: batch() state is per-thread, so each
+        # worker defers its own commits and an outer batch() here would wrap
+        # no writes at all.
+        with ThreadPoolExecutor(max_workers=min(16, len(queries) or 1)) as executor:
+            results = list(executor.map(self.process_query, queries))
+
+        for result in results:
             if result['success']:
                 successful += 1
                 total_time += result['performance_metrics']['total_processing_time']
@@ -277,4 +438,5 @@ class EnhancedComplianceAwareAgentSystem:
     
     def __del__(self):
         """Cleanup when system is destroyed"""
+        self._phase_executor.shutdown(wait=False)
         print("Multi-Agent System shutdown complete")
\ No newline at end of file
@@ -1,18 +1,209 @@
 # src/memory_system.py
+import copy
 import json
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Dict, Any, List
 import hashlib
 
+try:  # orjson decodes/encodes JSON several times faster when available
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj)
+
+    _loads = json.loads
+
+# Hot-path SQL lives in module constants so every call site reuses the
+# same string object and reliably hits sqlite3's prepared-statement cache
+# even when many distinct statements interleave.
+_SQL_INSERT_VIOLATION = '''
+    INSERT INTO compliance_violations (violation_type, description, timestamp, severity)
+    VALUES (?, ?, ?, ?)
+'''
+
+_SQL_INSERT_INSIGHT = '''
+    INSERT INTO system_insights (insight_type, insight_data, confidence, timestamp)
+    VALUES (?, ?, ?, ?)
+'''
+
+_SQL_INSERT_QUERY = '''
+    INSERT INTO query_history (query_hash, query_text, timestamp, success_rate, avg_processing_time)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+_SQL_SELECT_SUCCESS_RATE = 'SELECT success_rate FROM query_history WHERE query_hash = ?'
+
+_SQL_BUMP_VIOLATION_COUNT = '''
+    INSERT INTO violation_counts (violation_type, severity, count)
+    VALUES (?, ?, 1)
+    ON CONFLICT(violation_type, severity) DO UPDATE SET count = count + 1
+'''
+
+# Single-statement upserts: SQLite evaluates every SET expression against
+# the pre-update row, so the running averages below use the old count even
+# though execution_count/total_count are bumped in the same statement.
+# Averages use the Welford increment avg + (new - avg) / (n + 1), which
+# avoids the multiply-then-divide round trip through large intermediates
+# and stays numerically stable over long series.
+_SQL_UPSERT_QUERY = '''
+    INSERT INTO query_history (query_hash, query_text, timestamp, success_rate, avg_processing_time)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(query_hash) DO UPDATE SET
+        success_rate = success_rate
+                       + (excluded.success_rate - success_rate) / (execution_count + 1),
+        avg_processing_time = avg_processing_time
+                              + (excluded.avg_processing_time - avg_processing_time)
+                                / (execution_count + 1),
+        execution_count = execution_count + 1,
+        timestamp = excluded.timestamp
+'''
+
+_SQL_UPSERT_AGENT_PERFORMANCE = '''
+    INSERT INTO agent_performance
+        (agent_name, task_type, success_count, total_count, avg_response_time, last_updated)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(agent_name, task_type) DO UPDATE SET
+        success_count = success_count + excluded.success_count,
+        total_count = total_count + 1,
+        avg_response_time = avg_response_time
+                            + (excluded.avg_response_time - avg_response_time)
+                              / (total_count + 1),
+        last_updated = excluded.last_updated
+'''
+
 class EnhancedMemorySystem:
+    # How long cached read results stay fresh; staleness of this order is
+    # acceptable for a learning/analytics store
+    _CACHE_TTL = 30.0
+
     def __init__(self, db_path: str = "agent_memory.db"):
         self.db_path = db_path
+        # Per-thread batch state: each thread tracks its own open batch()
+        # transaction (conn attribute, None/absent when no batch is open),
+        # so concurrent outer batches on different threads never see or
+        # tear down one another's state. The lock serializes all writers
+        # on the shared connection.
+        self._batch_state = threading.local()
+        self._write_lock = threading.Lock()
+
+        # Read caches: success rates are invalidated per query hash by the
+        # write path plus a TTL backstop; the insights snapshot is keyed on
+        # a write-generation counter so any write makes it stale
+        self._success_rate_cache: Dict[str, tuple] = {}
+        self._insights_cache = None
+        self._last_recs = None
+        self._write_gen = 0
+
+        # Long-lived connection shared by every read and write: opening a
+        # connection per call reparses the schema and reacquires the file,
+        # which dominates the hot log_query path. The lock serializes
+        # access across threads (check_same_thread=False makes that legal).
+        # Schema setup runs on this same connection so ":memory:" databases
+        # (used by the tests) keep their tables.
+        self._conn = self._connect()
         self._init_database()
+
+    def close(self):
+        """Close the shared connection; the instance is unusable afterwards"""
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            conn.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with throughput-oriented PRAGMAs applied
+
+        WAL journaling plus synchronous=NORMAL cuts the fsync count on the
+        logging hot path dramatically; crash-loss of the last few rows is
+        acceptable for this learning/analytics store.
+        """
+        conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                               cached_statements=256)
+        self._configure(conn)
+        return conn
+
+    @staticmethod
+    def _configure(conn: sqlite3.Connection):
+        """Apply the standard PRAGMA set to a connection"""
+        # C-level rows with name access; positional indexing still works
+        # for the tuple-style reads
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA busy_timeout=5000")
+
+    @contextmanager
+    def _write(self):
+        """Yield the connection for one write operation
+
+        Insert-only callers run conn.execute() directly, skipping the
+        explicit cursor allocation. Outside a batch() block the write
+        commits immediately; inside one the commit is deferred until the
+        block exits.
+        """
+        # Capture the connection before taking the lock: this thread owns
+        # its batch state, so the value cannot change under it, and other
+        # threads' batches exiting cannot null it out mid-write.
+        batch_conn = getattr(self._batch_state, 'conn', None)
+        if batch_conn is not None:
+            with self._write_lock:
+                yield batch_conn
+                self._write_gen += 1
+        else:
+            with self._write_lock:
+                yield self._conn
+                self._conn.commit()
+                self._write_gen += 1
+
+    @contextmanager
+    def _read(self):
+        """Yield a cursor for read-only queries on the shared connection"""
+        with self._write_lock:
+            yield self._conn.cursor()
+
+    @contextmanager
+    def batch(self):
+        """Coalesce all writes in the block into a single transaction
+
+        Per-write autocommits each pay their own fsync; wrapping a batch of
+        queries in one transaction amortizes that to a single commit.
+
+        Reentrant per thread: a nested batch() on the same thread joins the
+        enclosing transaction, which commits when that thread's outermost
+        block exits. Batches on other threads are independent.
+        """
+        state = self._batch_state
+        if getattr(state, 'conn', None) is not None:
+            yield self
+            return
+        state.conn = self._conn
+        try:
+            yield self
+            with self._write_lock:
+                self._conn.commit()
+        finally:
+            state.conn = None
+
     def _init_database(self):
         """Initialize SQLite database for persistent memory"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conn
         cursor = conn.cursor()
         
         # Query history table
@@ -52,7 +243,24 @@ class EnhancedMemorySystem:
                 last_updated TEXT
             )
         ''')
+
+        # Conflict target for the agent-performance upsert
+        cursor.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS ux_agent_performance_key
+            ON agent_performance (agent_name, task_type)
+        ''')
         
+        # Materialized per-type violation counts, maintained on write so
+        # analytics reads are O(1) lookups instead of rescans of raw rows
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS violation_counts (
+                violation_type TEXT,
+                severity TEXT,
+                count INTEGER DEFAULT 0,
+                PRIMARY KEY (violation_type, severity)
+            )
+        ''')
+
         # System insights table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS system_insights (
@@ -63,230 +271,268 @@ class EnhancedMemorySystem:
                 timestamp TEXT
             )
         ''')
-        
+
+        # Secondary indexes for the hot read paths. query_hash and the
+        # (agent_name, task_type) pair already have implicit indexes via
+        # their UNIQUE constraints, so only the timestamp filters and the
+        # insight-type lookup need covering here.
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS ix_qh_ts
+            ON query_history (timestamp)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS ix_cv_ts
+            ON compliance_violations (timestamp, resolved)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS ix_si_type_ts
+            ON system_insights (insight_type, timestamp)
+        ''')
+
         conn.commit()
-        conn.close()
-    
+
     def log_query(self, query: str, success: bool = True, processing_time: float = 0):
         """Log query with learning capabilities"""
-        query_hash = self._hash_query(query)
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Check if query exists
-        cursor.execute(
-            'SELECT execution_count, success_rate, avg_processing_time FROM query_history WHERE query_hash = ?',
-            (query_hash,)
-        )
-        result = cursor.fetchone()
-        
+        with self._write() as conn:
+            self._upsert_query(conn, query, success, processing_time, datetime.now().isoformat())
+
+    def log_queries_batch(self, records: List[tuple]):
+        """Log multiple (query, success, processing_time) records in one transaction
+
+        Bulk callers pay a single commit (and fsync) instead of one per
+        query, and unseen queries go through one executemany INSERT rather
+        than a SELECT-then-INSERT round trip each.
+        """
+        if not records:
+            return
         current_time = datetime.now().isoformat()
-        
-        if result:
-            # Update existing query
-            execution_count, old_success_rate, old_avg_time = result
-            new_count = execution_count + 1
-            new_success_rate = ((old_success_rate * execution_count) + int(success)) / new_count
-            
-            # Update average processing time
-            if old_avg_time:
-                new_avg_time = ((old_avg_time * execution_count) + processing_time) / new_count
-            else:
-                new_avg_time = processing_time
-            
-            cursor.execute('''
-                UPDATE query_history 
-                SET execution_count = ?, success_rate = ?, avg_processing_time = ?, timestamp = ?
-                WHERE query_hash = ?
-            ''', (new_count, new_success_rate, new_avg_time, current_time, query_hash))
-        else:
-            # Insert new query
-            cursor.execute('''
-                INSERT INTO query_history (query_hash, query_text, timestamp, success_rate, avg_processing_time)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (query_hash, query, current_time, float(success), processing_time))
-        
-        conn.commit()
-        conn.close()
-    
+        with self._write() as conn:
+            # Take the write lock up front rather than on first write so
+            # concurrent writers queue here instead of mid-batch
+            if not conn.in_transaction:
+                conn.execute('BEGIN IMMEDIATE')
+
+            hashed = [(self._hash_query(query), query, success, processing_time)
+                      for query, success, processing_time in records]
+            placeholders = ','.join('?' * len(hashed))
+            seen = {row[0] for row in conn.execute(
+                f'SELECT query_hash FROM query_history WHERE query_hash IN ({placeholders})',
+                [query_hash for query_hash, _, _, _ in hashed]
+            )}
+
+            # First occurrence of an unseen query inserts via executemany;
+            # repeats and known queries go through a second executemany on
+            # the upsert statement, reusing the hashes computed above
+            new_rows = []
+            update_rows = []
+            for query_hash, query, success, processing_time in hashed:
+                row = (query_hash, query, current_time, float(success), processing_time)
+                if query_hash in seen:
+                    update_rows.append(row)
+                else:
+                    seen.add(query_hash)
+                    new_rows.append(row)
+
+            if new_rows:
+                conn.executemany(_SQL_INSERT_QUERY, new_rows)
+            if update_rows:
+                conn.executemany(_SQL_UPSERT_QUERY, update_rows)
+            for query_hash, _, _, _ in hashed:
+                self._success_rate_cache.pop(query_hash, None)
+
+    def _upsert_query(self, conn, query: str, success: bool, processing_time: float, current_time: str):
+        """Insert or update a single query_history row on an open connection"""
+        query_hash = self._hash_query(query)
+        conn.execute(_SQL_UPSERT_QUERY,
+                     (query_hash, query, current_time, float(success), processing_time))
+        self._success_rate_cache.pop(query_hash, None)
+
     def log_compliance_violation(self, violation_type: str, description: str, severity: str = "medium"):
         """Log compliance violations for learning"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO compliance_violations (violation_type, description, timestamp, severity)
-            VALUES (?, ?, ?, ?)
-        ''', (violation_type, description, datetime.now().isoformat(), severity))
-        
-        conn.commit()
-        conn.close()
+        with self._write() as conn:
+            conn.execute(_SQL_INSERT_VIOLATION,
+                         (violation_type, description, datetime.now().isoformat(), severity))
+            conn.execute(_SQL_BUMP_VIOLATION_COUNT, (violation_type, severity))
+
+    def log_violations_batch(self, violations: List[tuple]):
+        """Log multiple (violation_type, description, severity) rows in one transaction"""
+        timestamp = datetime.now().isoformat()
+        with self._write() as conn:
+            conn.executemany(_SQL_INSERT_VIOLATION,
+                             [(vtype, desc, timestamp, severity)
+                              for vtype, desc, severity in violations])
+            conn.executemany(_SQL_BUMP_VIOLATION_COUNT,
+                             [(vtype, severity) for vtype, _, severity in violations])
+
+    def get_violation_counts(self) -> List[Dict[str, Any]]:
+        """Get lifetime violation counts from the materialized counter table"""
+        with self._read() as cursor:
+            cursor.execute('''
+                SELECT violation_type, severity, count FROM violation_counts
+                ORDER BY count DESC
+            ''')
+            return [
+                {'type': row['violation_type'], 'severity': row['severity'],
+                 'count': row['count']}
+                for row in cursor
+            ]
     
     def get_query_success_rate(self, query: str) -> float:
         """Get historical success rate for similar queries"""
         query_hash = self._hash_query(query)
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            'SELECT success_rate FROM query_history WHERE query_hash = ?',
-            (query_hash,)
-        )
-        result = cursor.fetchone()
-        
-        conn.close()
-        
-        return result[0] if result else 0.5  # Default confidence
+        now = time.monotonic()
+
+        cached = self._success_rate_cache.get(query_hash)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        with self._read() as cursor:
+            cursor.execute(_SQL_SELECT_SUCCESS_RATE, (query_hash,))
+            result = cursor.fetchone()
+
+        rate = result[0] if result else 0.5  # Default confidence
+        if len(self._success_rate_cache) >= 4096:
+            self._success_rate_cache.clear()
+        self._success_rate_cache[query_hash] = (now + self._CACHE_TTL, rate)
+        return rate
     
     def get_common_violations(self, days: int = 30) -> List[Dict[str, Any]]:
         """Get frequently occurring compliance violations"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
-        
-        cursor.execute('''
-            SELECT violation_type, COUNT(*) as count, severity
-            FROM compliance_violations 
-            WHERE timestamp > ? AND resolved = FALSE
-            GROUP BY violation_type, severity
-            ORDER BY count DESC
-            LIMIT 10
-        ''', (cutoff_date,))
-        
-        violations = [
-            {'type': row[0], 'count': row[1], 'severity': row[2]}
-            for row in cursor.fetchall()
-        ]
-        
-        conn.close()
-        return violations
+
+        with self._read() as cursor:
+            cursor.execute('''
+                SELECT violation_type, COUNT(*) as count, severity
+                FROM compliance_violations
+                WHERE timestamp > ? AND resolved = FALSE
+                GROUP BY violation_type, severity
+                ORDER BY count DESC
+                LIMIT 10
+            ''', (cutoff_date,))
+
+            return [
+                {'type': row['violation_type'], 'count': row['count'],
+                 'severity': row['severity']}
+                for row in cursor
+            ]
     
-    def update_agent_performance(self, agent_name: str, task_type: str, 
+    def update_agent_performance(self, agent_name: str, task_type: str,
                                success: bool, response_time: float):
         """Update agent performance metrics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Check if record exists
-        cursor.execute('''
-            SELECT success_count, total_count, avg_response_time FROM agent_performance 
-            WHERE agent_name = ? AND task_type = ?
-        ''', (agent_name, task_type))
-        
-        result = cursor.fetchone()
+        with self._write() as conn:
+            self._upsert_agent_performance(conn, agent_name, task_type, success, response_time,
+                                           datetime.now().isoformat())
+
+    def update_agent_performance_batch(self, records: List[tuple]):
+        """Update metrics for many (agent_name, task_type, success, response_time)
+        records in a single transaction"""
         current_time = datetime.now().isoformat()
-        
-        if result:
-            success_count, total_count, old_avg_time = result
-            new_success_count = success_count + int(success)
-            new_total_count = total_count + 1
-            
-            # Calculate new average time
-            if old_avg_time:
-                new_avg_time = ((old_avg_time * total_count) + response_time) / new_total_count
-            else:
-                new_avg_time = response_time
-            
-            cursor.execute('''
-                UPDATE agent_performance 
-                SET success_count = ?, total_count = ?, avg_response_time = ?, last_updated = ?
-                WHERE agent_name = ? AND task_type = ?
-            ''', (new_success_count, new_total_count, new_avg_time, current_time, agent_name, task_type))
-        else:
-            cursor.execute('''
-                INSERT INTO agent_performance 
-                (agent_name, task_type, success_count, total_count, avg_response_time, last_updated)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (agent_name, task_type, int(success), 1, response_time, current_time))
-        
-        conn.commit()
-        conn.close()
-    
+        with self._write() as conn:
+            for agent_name, task_type, success, response_time in records:
+                self._upsert_agent_performance(conn, agent_name, task_type, success,
+                                               response_time, current_time)
+
+    def _upsert_agent_performance(self, conn, agent_name: str, task_type: str,
+                                  success: bool, response_time: float, current_time: str):
+        """Insert or update a single agent_performance row on an open connection"""
+        conn.execute(_SQL_UPSERT_AGENT_PERFORMANCE,
+                     (agent_name, task_type, int(success), 1, response_time, current_time))
+
     def store_system_insight(self, insight_type: str, insight_data: Dict[str, Any], confidence: float = 0.8):
         """Store system-generated insights"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO system_insights (insight_type, insight_data, confidence, timestamp)
-            VALUES (?, ?, ?, ?)
-        ''', (insight_type, json.dumps(insight_data), confidence, datetime.now().isoformat()))
-        
-        conn.commit()
-        conn.close()
+        with self._write() as conn:
+            conn.execute(_SQL_INSERT_INSIGHT,
+                         (insight_type, _dumps(insight_data), confidence,
+                          datetime.now().isoformat()))
     
     def get_recent_insights(self, insight_type: str = None, limit: int = 5) -> List[Dict[str, Any]]:
         """Get recent system insights"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        if insight_type:
-            cursor.execute('''
-                SELECT insight_type, insight_data, confidence, timestamp
-                FROM system_insights 
-                WHERE insight_type = ?
-                ORDER BY timestamp DESC
-                LIMIT ?
-            ''', (insight_type, limit))
-        else:
-            cursor.execute('''
-                SELECT insight_type, insight_data, confidence, timestamp
-                FROM system_insights 
-                ORDER BY timestamp DESC
-                LIMIT ?
-            ''', (limit,))
-        
-        insights = []
-        for row in cursor.fetchall():
-            insights.append({
-                'type': row[0],
-                'data': json.loads(row[1]),
-                'confidence': row[2],
-                'timestamp': row[3]
-            })
-        
-        conn.close()
+        with self._read() as cursor:
+            if insight_type:
+                cursor.execute('''
+                    SELECT insight_type, insight_data, confidence, timestamp
+                    FROM system_insights
+                    WHERE insight_type = ?
+                    ORDER BY timestamp DESC
+                    LIMIT ?
+                ''', (insight_type, limit))
+            else:
+                cursor.execute('''
+                    SELECT insight_type, insight_data, confidence, timestamp
+                    FROM system_insights
+                    ORDER BY timestamp DESC
+                    LIMIT ?
+                ''', (limit,))
+
+            # Stream in chunks rather than materializing every row before
+            # decoding; keeps peak memory flat for large insight payloads
+            insights = []
+            while rows := cursor.fetchmany(256):
+                insights.extend(
+                    {
+                        'type': row['insight_type'],
+                        'data': _loads(row['insight_data']),
+                        'confidence': row['confidence'],
+                        'timestamp': row['timestamp']
+                    }
+                    for row in rows
+                )
+
         return insights
     
     def _hash_query(self, query: str) -> str:
-        """Create hash of query for deduplication"""
-        return hashlib.md5(query.encode()).hexdigest()
+        """Create hash of query for deduplication
+
+        blake2b with a 16-byte digest is faster than md5 for short inputs
+        and is not deprecated for security-sensitive contexts. Histories
+        hashed under the old scheme simply re-learn.
+        """
+        return hashlib.blake2b(query.encode(), digest_size=16).hexdigest()
     
     def get_system_insights(self) -> Dict[str, Any]:
         """Get overall system insights from memory"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Total queries
-        cursor.execute('SELECT COUNT(*) FROM query_history')
-        total_queries = cursor.fetchone()[0] or 0
-        
-        # Average success rate
-        cursor.execute('SELECT AVG(success_rate) FROM query_history')
-        avg_success_result = cursor.fetchone()
-        avg_success = avg_success_result[0] if avg_success_result[0] is not None else 0
-        
-        # Recent violations
+        now = time.monotonic()
+        cached = self._insights_cache
+        if cached is not None and cached[0] == self._write_gen and cached[1] > now:
+            return copy.deepcopy(cached[2])
+
+        # One wall-clock read for both trend windows
+        now_dt = datetime.now()
+        week_ago = (now_dt - timedelta(days=7)).isoformat()
+        two_weeks_ago = (now_dt - timedelta(days=14)).isoformat()
+
+        with self._read() as cursor:
+            # Totals, lifetime average, and both trend windows in one pass
+            # over query_history via conditional aggregation
+            cursor.execute('''
+                SELECT COUNT(*),
+                       AVG(success_rate),
+                       AVG(CASE WHEN timestamp > ? THEN success_rate END),
+                       AVG(CASE WHEN timestamp > ? AND timestamp <= ? THEN success_rate END)
+                FROM query_history
+            ''', (week_ago, two_weeks_ago, week_ago))
+            total_queries, avg_success, recent_success, previous_success = cursor.fetchone()
+            total_queries = total_queries or 0
+            avg_success = avg_success if avg_success is not None else 0
+
+            # Agent performance
+            cursor.execute('''
+                SELECT agent_name,
+                       AVG(success_count * 1.0 / total_count) as success_rate,
+                       AVG(avg_response_time) as avg_time
+                FROM agent_performance
+                GROUP BY agent_name
+            ''')
+            agent_performance = {}
+            for row in cursor.fetchall():
+                agent_performance[row[0]] = {
+                    'success_rate': row[1] or 0,
+                    'avg_response_time': row[2] or 0
+                }
+
+        # Recent violations (takes the lock itself, so read outside _read())
         common_violations = self.get_common_violations(days=7)
-        
-        # Agent performance
-        cursor.execute('''
-            SELECT agent_name, 
-                   AVG(success_count * 1.0 / total_count) as success_rate,
-                   AVG(avg_response_time) as avg_time
-            FROM agent_performance 
-            GROUP BY agent_name
-        ''')
-        agent_performance = {}
-        for row in cursor.fetchall():
-            agent_performance[row[0]] = {
-                'success_rate': row[1] or 0,
-                'avg_response_time': row[2] or 0
-            }
-        
+
         # System health calculation
         if avg_success > 0.8:
             system_health = 'excellent'
@@ -296,43 +542,22 @@ class EnhancedMemorySystem:
             system_health = 'fair'
         else:
             system_health = 'poor'
-        
-        conn.close()
-        
-        return {
+
+        insights = {
             'total_queries_processed': total_queries,
             'average_success_rate': round(avg_success, 3),
             'common_compliance_issues': common_violations,
+            'violation_totals': self.get_violation_counts(),
             'agent_performance': agent_performance,
             'system_health': system_health,
-            'performance_trend': self._calculate_performance_trend()
+            'performance_trend': self._trend_label(recent_success or 0, previous_success or 0)
         }
+        self._insights_cache = (self._write_gen, now + self._CACHE_TTL, insights)
+        return copy.deepcopy(insights)
     
-    def _calculate_performance_trend(self) -> str:
-        """Calculate performance trend over time"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get success rates for last 7 days and previous 7 days
-        week_ago = (datetime.now() - timedelta(days=7)).isoformat()
-        two_weeks_ago = (datetime.now() - timedelta(days=14)).isoformat()
-        
-        # Recent week
-        cursor.execute('''
-            SELECT AVG(success_rate) FROM query_history 
-            WHERE timestamp > ?
-        ''', (week_ago,))
-        recent_success = cursor.fetchone()[0] or 0
-        
-        # Previous week
-        cursor.execute('''
-            SELECT AVG(success_rate) FROM query_history 
-            WHERE timestamp > ? AND timestamp <= ?
-        ''', (two_weeks_ago, week_ago))
-        previous_success = cursor.fetchone()[0] or 0
-        
-        conn.close()
-        
+    @staticmethod
+    def _trend_label(recent_success: float, previous_success: float) -> str:
+        """Classify the week-over-week success-rate movement"""
         if recent_success > previous_success + 0.05:
             return 'improving'
         elif recent_success < previous_success - 0.05:
@@ -341,24 +566,37 @@ class EnhancedMemorySystem:
             return 'stable'
     
     def get_agent_recommendations(self) -> List[str]:
-        """Generate recommendations based on system performance"""
+        """Generate recommendations based on system performance
+
+        Caps generation at five instead of building everything and
+        slicing, and reuses the previous result while no write has
+        happened since it was computed.
+        """
+        cached = self._last_recs
+        if cached is not None and cached[0] == self._write_gen:
+            return list(cached[1])
+
         recommendations = []
         insights = self.get_system_insights()
-        
+
         # Check agent performance
         for agent, performance in insights['agent_performance'].items():
             if performance['success_rate'] < 0.6:
                 recommendations.append(f"Review {agent} performance - low success rate detected")
             if performance['avg_response_time'] > 5.0:  # seconds
                 recommendations.append(f"Optimize {agent} - high response time detected")
-        
+            if len(recommendations) >= 5:
+                break
+
         # Check compliance issues
-        if insights['common_compliance_issues']:
+        if len(recommendations) < 5 and insights['common_compliance_issues']:
             top_issue = insights['common_compliance_issues'][0]
             recommendations.append(f"Address frequent {top_issue['type']} compliance violations")
-        
+
         # System health recommendations
-        if insights['system_health'] in ['fair', 'poor']:
+        if len(recommendations) < 5 and insights['system_health'] in ['fair', 'poor']:
             recommendations.append("System performance needs attention - review logs and metrics")
-        
-        return recommendations[:5]  # Return top 5 recommendations
\ No newline at end of file
+
+        recommendations = recommendations[:5]
+        self._last_recs = (self._write_gen, tuple(recommendations))
+        return recommendations
\ No newline at end of file
@@ -1,16 +1,61 @@
 # src/retrieval_agent.py
 import requests
+import itertools
 import json
+import re
+import threading
+from collections import Counter, deque
 from typing import Dict, Any, Optional
 from datetime import datetime
 import random
 
+# Mock weather values are drawn from pools baked once at import with a
+# seeded RNG, so generating a reading is a handful of tuple indexes
+# instead of six Mersenne-Twister draws per call. Values repeat after
+# _POOL_SIZE readings, which is irrelevant for mock data.
+_POOL_SIZE = 10_000
+_rng = random.Random(0)
+_TEMP_POOL = tuple(round(_rng.uniform(-5, 35), 1) for _ in range(_POOL_SIZE))
+_HUMIDITY_POOL = tuple(_rng.randint(30, 95) for _ in range(_POOL_SIZE))
+_PRESSURE_POOL = tuple(_rng.randint(1000, 1030) for _ in range(_POOL_SIZE))
+_WIND_POOL = tuple(round(_rng.uniform(0, 25), 1) for _ in range(_POOL_SIZE))
+_CONDITION_POOL = tuple(_rng.choice(("clear", "cloudy", "rainy", "snowy"))
+                        for _ in range(_POOL_SIZE))
+_VISIBILITY_POOL = tuple(_rng.randint(1, 10) for _ in range(_POOL_SIZE))
+del _rng
+
 class RetrievalAgent:
+    # Known locations fused into one case-insensitive alternation: a single
+    # scan over the query replaces one substring pass per location
+    _LOC_RE = re.compile(
+        r'\b(london|paris|tokyo|berlin|new york)\b', re.IGNORECASE)
+
     def __init__(self):
         self.api_base_url = "http://api.openweathermap.org/data/2.5"
         # Using a demo API key - in production, use environment variables
         self.api_key = "demo_key_12345"  # This will work with mock data
-        self.request_history = []
+        # Ring buffer keeps recent requests bounded in long-running agents;
+        # lifetime totals and per-type counts are maintained incrementally
+        # so stats never rescan the history
+        self.request_history = deque(maxlen=10_000)
+        self._total_requests = 0
+        self._type_counts = Counter()
+        self._pool_idx = 0
+        # Guards the history/counter bookkeeping and the pool cursor:
+        # fetch_data runs concurrently on the batch worker threads, and the
+        # check-evict-append sequence plus the counter increments are not
+        # atomic on their own
+        self._state_lock = threading.Lock()
+
+    def _log_request(self, entry: Dict[str, Any]):
+        """Record a request, keeping the type counts in step with eviction"""
+        with self._state_lock:
+            history = self.request_history
+            if len(history) == history.maxlen:
+                self._type_counts[history[0]['type']] -= 1
+            history.append(entry)
+            self._type_counts[entry['type']] += 1
+            self._total_requests += 1
     
     def fetch_data(self, query: str) -> Dict[str, Any]:
         """
@@ -41,7 +86,7 @@ class RetrievalAgent:
         # )
         
         # Log the request
-        self.request_history.append({
+        self._log_request({
             'timestamp': datetime.now().isoformat(),
             'query': query,
             'location': location,
@@ -55,7 +100,7 @@ class RetrievalAgent:
         query_lower = query.lower()
         
         # Log the request
-        self.request_history.append({
+        self._log_request({
             'timestamp': datetime.now().isoformat(),
             'query': query,
             'type': 'generic'
@@ -72,27 +117,23 @@ class RetrievalAgent:
     
     def _extract_location(self, query: str) -> str:
         """Extract location from query string"""
-        locations = ['london', 'paris', 'tokyo', 'berlin', 'new york', 'tokyo']
-        query_lower = query.lower()
-        
-        for location in locations:
-            if location in query_lower:
-                return location.title()
-        
-        return "London"  # Default location
+        match = self._LOC_RE.search(query)
+        return match.group(1).title() if match else "London"  # Default location
     
     def _generate_mock_weather_data(self, location: str) -> Dict[str, Any]:
-        """Generate realistic mock weather data"""
-        base_temp = random.uniform(-5, 35)  # Realistic temperature range
-        
+        """Generate realistic mock weather data from the pre-baked pools"""
+        with self._state_lock:
+            i = self._pool_idx % _POOL_SIZE
+            self._pool_idx += 1
+
         return {
             "location": location,
-            "temperature": round(base_temp, 1),
-            "humidity": random.randint(30, 95),
-            "pressure": random.randint(1000, 1030),
-            "wind_speed": round(random.uniform(0, 25), 1),
-            "weather_condition": random.choice(["clear", "cloudy", "rainy", "snowy"]),
-            "visibility": random.randint(1, 10),
+            "temperature": _TEMP_POOL[i],
+            "humidity": _HUMIDITY_POOL[i],
+            "pressure": _PRESSURE_POOL[i],
+            "wind_speed": _WIND_POOL[i],
+            "weather_condition": _CONDITION_POOL[i],
+            "visibility": _VISIBILITY_POOL[i],
             "timestamp": datetime.now().isoformat(),
             "data_source": "OpenWeatherMap",
             "units": "metric"
@@ -163,16 +204,18 @@ class RetrievalAgent:
     
     def get_request_stats(self) -> Dict[str, Any]:
         """Get retrieval statistics"""
-        return {
-            "total_requests": len(self.request_history),
-            "recent_requests": self.request_history[-5:] if self.request_history else [],
-            "most_common_type": self._get_most_common_request_type()
-        }
-    
+        # Snapshot under the lock so the total and the tail stay consistent
+        # while requests land on other threads
+        with self._state_lock:
+            history = self.request_history
+            return {
+                "total_requests": self._total_requests,
+                "recent_requests": list(itertools.islice(history, max(0, len(history) - 5), None)),
+                "most_common_type": self._get_most_common_request_type()
+            }
+
     def _get_most_common_request_type(self) -> str:
         """Get most common request type"""
-        if not self.request_history:
+        if not self._type_counts:
             return "none"
-        
-        types = [req['type'] for req in self.request_history]
-        return max(set(types), key=types.count)
\ No newline at end of file
+        return self._type_counts.most_common(1)[0][0]
\ No newline at end of file
@@ -33,7 +33,9 @@ def test_core_functionality():
         print("✅ System analytics retrieved")
         print(f"   System health: {analytics['system_health']['status']}")
         
-        # Cleanup
+        # Cleanup: close the connection first so the WAL/SHM sidecars are
+        # checkpointed into the main file instead of surviving the remove
+        system.memory_system.close()
         if os.path.exists("test.db"):
             os.remove("test.db")
             
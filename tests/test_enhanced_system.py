@@ -2,7 +2,6 @@
 import unittest
 import json
 import os
-import tempfile
 from datetime import datetime, timedelta
 
 # Add src to path
@@ -59,6 +58,31 @@ class TestEnhancedComplianceAgent(unittest.TestCase):
         self.assertFalse(result['overall_compliant'])
         self.assertTrue(len(result['regulation_results']['gdpr']['violations']) > 0)
 
+    def test_validate_compliance_batch_matches_individual(self):
+        """Test batch validation matches per-call results, duplicates included"""
+        payloads = [
+            {"temperature": 25, "location": "Berlin"},
+            {"ssn": "123-45-6789", "diagnosis": "diabetes care"},
+            {"temperature": 25, "location": "Berlin"},  # duplicate: cache hit
+        ]
+
+        batch_agent = EnhancedComplianceAgent()
+        batch_results = batch_agent.validate_compliance_batch(payloads, ['hipaa', 'gdpr'])
+        individual_results = [self.compliance_agent.validate_compliance(p, ['hipaa', 'gdpr'])
+                              for p in payloads]
+
+        self.assertEqual(len(batch_results), len(payloads))
+        for batch_result, individual_result in zip(batch_results, individual_results):
+            self.assertEqual(batch_result['overall_compliant'],
+                             individual_result['overall_compliant'])
+            self.assertEqual(batch_result['regulation_results'],
+                             individual_result['regulation_results'])
+            self.assertEqual(batch_result['summary'], individual_result['summary'])
+            self.assertEqual(batch_result['payload_hash'], individual_result['payload_hash'])
+
+        # Cached duplicates still count as checks in the stats
+        self.assertEqual(batch_agent.get_compliance_stats()['total_checks'], len(payloads))
+
 class TestEnhancedReasoningAgent(unittest.TestCase):
     def setUp(self):
         self.reasoning_agent = EnhancedReasoningAgent()
@@ -86,15 +110,11 @@ class TestEnhancedReasoningAgent(unittest.TestCase):
 
 class TestEnhancedMemorySystem(unittest.TestCase):
     def setUp(self):
-        # Use temporary database for tests
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-        self.temp_db.close()
-        self.memory_system = EnhancedMemorySystem(self.temp_db.name)
-    
+        # In-memory database: no disk I/O or fsync per logged query
+        self.memory_system = EnhancedMemorySystem(":memory:")
+
     def tearDown(self):
-        # Clean up temporary database
-        if os.path.exists(self.temp_db.name):
-            os.unlink(self.temp_db.name)
+        self.memory_system.close()
     
     def test_query_logging_and_learning(self):
         """Test query logging and success rate calculation"""
@@ -110,15 +130,93 @@ class TestEnhancedMemorySystem(unittest.TestCase):
         success_rate = self.memory_system.get_query_success_rate(query)
         self.assertEqual(success_rate, 0.75)  # 3 success / 4 total
 
+    def test_avg_processing_time_tracking(self):
+        """Test running average of processing time across repeated queries"""
+        query = "What's the weather in London?"
+
+        for processing_time in (0.2, 0.4, 0.6):
+            self.memory_system.log_query(query, success=True, processing_time=processing_time)
+
+        cursor = self.memory_system._conn.execute(
+            'SELECT avg_processing_time, execution_count FROM query_history WHERE query_text = ?',
+            (query,)
+        )
+        avg_time, execution_count = cursor.fetchone()
+        self.assertEqual(execution_count, 3)
+        self.assertAlmostEqual(avg_time, 0.4)
+
+    def test_log_queries_batch_matches_individual_logging(self):
+        """Test batch query logging, including a repeated unseen query"""
+        records = [
+            ("Weather in London", True, 0.2),
+            ("Weather in Paris", False, 0.4),
+            ("Weather in London", False, 0.6),  # repeat within the same batch
+        ]
+        self.memory_system.log_queries_batch(records)
+
+        individual = EnhancedMemorySystem(":memory:")
+        for query, success, processing_time in records:
+            individual.log_query(query, success=success, processing_time=processing_time)
+
+        for query in ("Weather in London", "Weather in Paris"):
+            self.assertEqual(self.memory_system.get_query_success_rate(query),
+                             individual.get_query_success_rate(query))
+
+        cursor = self.memory_system._conn.execute(
+            'SELECT execution_count, avg_processing_time FROM query_history WHERE query_text = ?',
+            ("Weather in London",)
+        )
+        execution_count, avg_time = cursor.fetchone()
+        self.assertEqual(execution_count, 2)
+        self.assertAlmostEqual(avg_time, 0.4)
+        individual.close()
+
+    def test_log_violations_batch_matches_individual(self):
+        """Test batch violation logging matches per-call logging"""
+        violations = [
+            ("hipaa", "SSN detected", "high"),
+            ("gdpr", "Email address detected", "medium"),
+            ("hipaa", "Diagnosis information detected", "high"),
+        ]
+        self.memory_system.log_violations_batch(violations)
+
+        individual = EnhancedMemorySystem(":memory:")
+        for violation_type, description, severity in violations:
+            individual.log_compliance_violation(violation_type, description, severity)
+
+        self.assertEqual(self.memory_system.get_violation_counts(),
+                         individual.get_violation_counts())
+        self.assertEqual(self.memory_system.get_common_violations(days=1),
+                         individual.get_common_violations(days=1))
+        individual.close()
+
+    def test_update_agent_performance_batch_matches_individual(self):
+        """Test batch performance updates match per-call upserts"""
+        records = [
+            ("retrieval", "weather", True, 0.1),
+            ("retrieval", "weather", False, 0.3),
+            ("reasoning", "analysis", True, 0.5),
+        ]
+        self.memory_system.update_agent_performance_batch(records)
+
+        individual = EnhancedMemorySystem(":memory:")
+        for agent_name, task_type, success, response_time in records:
+            individual.update_agent_performance(agent_name, task_type, success, response_time)
+
+        # last_updated excluded: the batch shares one timestamp
+        query = ('SELECT agent_name, task_type, success_count, total_count, avg_response_time '
+                 'FROM agent_performance ORDER BY agent_name, task_type')
+        batch_rows = [tuple(row) for row in self.memory_system._conn.execute(query)]
+        individual_rows = [tuple(row) for row in individual._conn.execute(query)]
+        self.assertEqual(batch_rows, individual_rows)
+        individual.close()
+
 class TestEndToEndSystem(unittest.TestCase):
     def setUp(self):
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-        self.temp_db.close()
-        self.system = EnhancedComplianceAwareAgentSystem(self.temp_db.name)
-    
+        self.system = EnhancedComplianceAwareAgentSystem(":memory:")
+
     def tearDown(self):
-        if os.path.exists(self.temp_db.name):
-            os.unlink(self.temp_db.name)
+        self.system.memory_system.close()
     
     def test_successful_weather_query(self):
         """Test end-to-end successful weather query"""
@@ -1,6 +1,5 @@
 # tests/test_integration.py
 import unittest
-import tempfile
 import os
 import sys
 
@@ -11,13 +10,11 @@ from main import EnhancedComplianceAwareAgentSystem
 
 class TestIntegration(unittest.TestCase):
     def setUp(self):
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-        self.temp_db.close()
-        self.system = EnhancedComplianceAwareAgentSystem(self.temp_db.name)
-    
+        # In-memory database: no disk I/O or fsync per logged query
+        self.system = EnhancedComplianceAwareAgentSystem(":memory:")
+
     def tearDown(self):
-        if os.path.exists(self.temp_db.name):
-            os.unlink(self.temp_db.name)
+        self.system.memory_system.close()
     
     def test_complete_workflow_clean_data(self):
         """Test complete workflow with clean, compliant data"""